@@ -1,35 +1,22 @@
-import clr
-import sys
 import os
-import platform
-
-
-# sys.path.append(r"C:\Program Files (x86)\DHI\2019\bin\x64")
-# sys.path.append(r"C:\Program Files (x86)\DHI\2020\bin\x64")
-dirname = os.path.dirname(__file__)
-mikebin = os.path.join(dirname, "bin")
-sys.path.append(mikebin)
-clr.AddReference("DHI.Generic.MikeZero.DFS")
-clr.AddReference("DHI.Generic.MikeZero.EUM")
-clr.AddReference("DHI.Projections")
-clr.AddReference("System")
-clr.AddReference("System.Runtime.InteropServices")
-clr.AddReference("System.Runtime")
-
-p = platform.architecture()
-
-if not "64" in p[0]:
-    raise Exception("This library has not been tested in a 32 bit system!!!!")
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 
+# The .NET runtime and the DHI assemblies are loaded on first use,
+# see mikeio.dotnet.add_reference
 
 from .dfs0 import Dfs0
 from .dfs1 import Dfs1
 from .dfs2 import Dfs2
 from .dfs3 import Dfs3
 from .dfsu import Dfsu, Mesh
+from .dutil import concat
 
 
-def read(filename, items=None, time_steps=None):
+def read(
+    filename, items=None, time_steps=None, dtype=np.float64, backend="dotnet"
+):
     """Read data from a dfs file
 
     Usage:
@@ -40,6 +27,12 @@ def read(filename, items=None, time_steps=None):
             Read only selected items, by number (0-based), or by name
     time_steps: int or list[int], optional
             Read only selected time_steps
+    dtype: np.dtype, optional
+            data type of the returned data, default np.float64,
+            use np.float32 to halve the memory use
+    backend: str, optional
+            "dotnet" (default) reads with the DHI .NET libraries,
+            "numpy" reads the file directly with numpy
             
     Return:
         Dataset(data, time, names)
@@ -49,21 +42,113 @@ def read(filename, items=None, time_steps=None):
 
     if ext == ".dfs0":
 
-        dfs = Dfs0(filename)
+        dfs = Dfs0(filename, backend=backend)
 
     elif ext == ".dfs1":
 
-        dfs = Dfs1(filename)
+        dfs = Dfs1(filename, backend=backend)
 
     elif ext == ".dfs2":
 
-        dfs = Dfs2(filename)
+        dfs = Dfs2(filename, backend=backend)
 
     elif ext == ".dfsu":
 
-        dfs = Dfsu(filename)
+        dfs = Dfsu(filename, backend=backend)
     else:
         raise Exception(f"{ext} is an unsupported extension")
 
-    return dfs.read(items, time_steps)
-
+    return dfs.read(items, time_steps, dtype=dtype)
+
+
+def read_many(
+    filenames,
+    items=None,
+    time_steps=None,
+    dtype=np.float64,
+    backend="dotnet",
+    workers=None,
+    executor="process",
+    concatenate=False,
+    errors="raise",
+):
+    """Read data from many dfs files in parallel
+
+    Parameters
+    ----------
+    filenames: list[str]
+        full path and file name of the dfs files
+    items: list[int] or list[str], optional
+        Read only selected items, by number (0-based), or by name
+    time_steps: int or list[int], optional
+        Read only selected time_steps
+    dtype: np.dtype, optional
+        data type of the returned data, default np.float64
+    backend: str, optional
+        "dotnet" (default) or "numpy", see `read`
+    workers: int, optional
+        number of workers, default number of processors on the machine.
+        With workers=1 the files are read one by one in this process
+    executor: str, optional
+        "process" (default) reads the files in a pool of processes,
+        "thread" in a pool of threads
+    concatenate: bool, optional
+        concatenate the datasets along the time axis (in the order of
+        filenames), default False
+    errors: str, optional
+        "raise" (default) raises the first error (in the order of filenames),
+        "capture" returns the exception in place of the dataset of a file
+        that could not be read (and skips the file when concatenating)
+
+    Returns
+    -------
+    list[Dataset] or Dataset
+        datasets in the order of filenames, or concatenated dataset
+
+    Examples
+    --------
+    >>> files = ["tests/testdata/random.dfs0", "tests/testdata/random.dfs0"]
+    >>> datasets = mikeio.read_many(files, workers=2)
+    >>> ds = mikeio.read_many(files, items=[0], concatenate=True)
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError("executor must be 'process' or 'thread'")
+    if errors not in ("raise", "capture"):
+        raise ValueError("errors must be 'raise' or 'capture'")
+
+    args = (items, time_steps, dtype, backend)
+
+    if workers == 1:
+        results = []
+        for filename in filenames:
+            try:
+                results.append(read(filename, *args))
+            except Exception as e:
+                if errors == "raise":
+                    raise
+                results.append(e)
+    else:
+        Executor = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with Executor(max_workers=workers) as pool:
+            futures = [pool.submit(read, filename, *args) for filename in filenames]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if errors == "raise":
+                        raise
+                    results.append(e)
+
+    if not concatenate:
+        return results
+
+    datasets = []
+    for filename, res in zip(filenames, results):
+        if isinstance(res, Exception):
+            warnings.warn(f"Skipping {filename}: {res}")
+        else:
+            datasets.append(res)
+    if len(datasets) == 0:
+        raise ValueError("No file could be read, there is nothing to concatenate")
+    return concat(datasets)
@@ -1,21 +1,19 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-import clr
-
-from DHI.Generic.MikeZero import eumUnit, eumQuantity
-from DHI.Generic.MikeZero.DFS import (
-    DfsFileFactory,
-    DfsFactory,
-    DfsSimpleType,
-    DataValueType,
-    DfsBuilder,
-)
-from DHI.Generic.MikeZero.DFS.dfs123 import Dfs1Builder
-
-from .dotnet import to_numpy, to_dotnet_float_array
+
+from .dotnet import LazyImport, BufferPool, to_dotnet_float_array
 from .helpers import safe_length
 
+eumUnit = LazyImport("DHI.Generic.MikeZero", "eumUnit")
+eumQuantity = LazyImport("DHI.Generic.MikeZero", "eumQuantity")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFactory")
+DfsSimpleType = LazyImport("DHI.Generic.MikeZero.DFS", "DfsSimpleType")
+DataValueType = LazyImport("DHI.Generic.MikeZero.DFS", "DataValueType")
+DfsBuilder = LazyImport("DHI.Generic.MikeZero.DFS", "DfsBuilder")
+Dfs1Builder = LazyImport("DHI.Generic.MikeZero.DFS.dfs123", "Dfs1Builder")
+
 
 def dfs2todfs1(dfs2file, dfs1file, axis=1, func=np.nanmean):
     """Aggregate file over an axis
@@ -103,11 +101,12 @@ def dfs2todfs1(dfs2file, dfs1file, axis=1, func=np.nanmean):
 
     # read-write data
     deleteValue = fileInfo.DeleteValueFloat
+    buffers = BufferPool()
     for it in range(n_time_steps):
         for item in range(n_items):
             itemdata = dfs_in.ReadItemTimeStep(item + 1, it)
 
-            d = to_numpy(itemdata.Data)
+            d = buffers.to_numpy(itemdata.Data, key=item)
             d[d == deleteValue] = np.nan
             d2 = d.reshape(ax.YCount, ax.XCount)
             d2 = np.flipud(d2)
@@ -175,11 +174,12 @@ def dfstodfs0(dfsfile, dfs0file, func=np.nanmean):
 
     # read-write data
     deleteValue = fileInfo.DeleteValueFloat
+    buffers = BufferPool()
     for it in range(n_time_steps):
         for item in range(n_items):
             itemdata = dfs_in.ReadItemTimeStep(item + 1, it)
 
-            d = to_numpy(itemdata.Data)
+            d = buffers.to_numpy(itemdata.Data, key=item)
             d[d == deleteValue] = np.nan
 
             d0 = func(d)
@@ -2,17 +2,26 @@ from datetime import datetime, timedelta
 import warnings
 import numpy as np
 from .helpers import safe_length
-from .dutil import Dataset, get_item_info
+from .dutil import (
+    Dataset,
+    create_data_block,
+    get_item_info,
+    get_valid_items_and_timesteps,
+    iter_timestep_blocks,
+)
+from .dfs_raw import RawDfsFile, validate_backend
 from .dotnet import (
+    LazyImport,
+    BufferPool,
     to_dotnet_datetime,
     from_dotnet_datetime,
 )
 from .eum import ItemInfo, TimeStep
-from DHI.Generic.MikeZero import eumQuantity
-from DHI.Generic.MikeZero.DFS import (
-    DfsSimpleType,
-    DataValueType,
-)
+
+eumQuantity = LazyImport("DHI.Generic.MikeZero", "eumQuantity")
+DfsSimpleType = LazyImport("DHI.Generic.MikeZero.DFS", "DfsSimpleType")
+DataValueType = LazyImport("DHI.Generic.MikeZero.DFS", "DataValueType")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
 
 
 class Dfs123:
@@ -28,9 +37,12 @@ class Dfs123:
     _override_coordinates = False
     _timeseries_unit = TimeStep.SECOND
     _dt = None
+    _backend = "dotnet"
+    _ndim = None  # number of spatial dimensions
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, backend="dotnet"):
         self._filename = filename
+        self._backend = validate_backend(backend)
 
     def _read_header(self, dfs):
         self._n_items = safe_length(dfs.ItemInfo)
@@ -45,6 +57,156 @@ class Dfs123:
 
         dfs.Close()
 
+    def _read_raw_header(self, raw):
+        self._n_items = raw.n_items
+        self._items = raw.get_item_info(list(range(self._n_items)))
+        self._start_time = raw.start_time
+        self._n_timesteps = raw.n_timesteps
+        if raw.projection is not None:
+            self._projstr, self._longitude, self._latitude, self._orientation = (
+                raw.projection
+            )
+        self._deletevalue = raw.deletevalue
+
+    def _read_raw(
+        self, items, time_steps, dtype, index=None, out=None, scratch_dir=None
+    ):
+        """Read items with the numpy backend, data dimensions [t, values]"""
+        raw = RawDfsFile(self._filename)
+        try:
+            self._n_items = raw.n_items
+            self._n_timesteps = raw.n_timesteps
+            if raw.n_timesteps == 0:
+                raise ValueError(
+                    "Static files (with no time steps) are not supported."
+                )
+
+            items, item_numbers, time_steps = get_valid_items_and_timesteps(
+                self, items, time_steps, source=raw
+            )
+
+            data_list = []
+            for item in item_numbers:
+                n = raw.item_size(item) if index is None else len(index)
+                shape = (len(time_steps), n)
+                data_list.append(create_data_block(shape, dtype, out, scratch_dir))
+
+            if index is not None:
+                index = {item: index for item in item_numbers}
+            raw.read(
+                item_numbers, time_steps, dtype=dtype, index=index, out=data_list
+            )
+            time = raw.get_time(time_steps)
+        finally:
+            raw.close()
+
+        return data_list, time, items
+
+    def iter_timesteps(
+        self, items=None, time_steps=None, chunk=1, dtype=np.float64
+    ):
+        """
+        Iterate over the file in blocks of chunk time steps
+
+        The file is opened once and the data is read into buffers that
+        are reused for every block, so the memory use is bounded by the
+        chunk size, not by the number of time steps in the file.
+
+        Parameters
+        ----------
+        items: list[int] or list[str], optional
+            Read only selected items, by number (0-based), or by name
+        time_steps: int or list[int], optional
+            Read only selected time_steps
+        chunk: int, optional
+            number of time steps in each block, default 1
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64
+
+        Yields
+        ------
+        list[datetime], dict
+            time of the time steps in the block and item name -> data with
+            dimensions [t, ...] as returned by read. The arrays are
+            overwritten by the next block, copy them to keep them.
+
+        Examples
+        --------
+        >>> dfs = Dfs2("tests/testdata/random.dfs2")
+        >>> for time, data in dfs.iter_timesteps(chunk=10):
+        ...     print(time[0], np.nanmax(data["testing water level"]))
+        """
+        if self._backend == "numpy":
+            source = RawDfsFile(self._filename)
+        else:
+            source = DfsFileFactory.DfsGenericOpen(self._filename)
+
+        try:
+            if self._backend == "numpy":
+                self._n_items = source.n_items
+                self._n_timesteps = source.n_timesteps
+                counts = source.item_axes[0].counts
+                start_time = source.start_time
+            else:
+                self._n_items = safe_length(source.ItemInfo)
+                self._n_timesteps = source.FileInfo.TimeAxis.NumberOfTimeSteps
+                axis = source.ItemInfo[0].SpatialAxis
+                counts = [axis.XCount]
+                if self._ndim >= 2:
+                    counts.append(axis.YCount)
+                if self._ndim == 3:
+                    counts.append(axis.ZCount)
+                start_time = from_dotnet_datetime(
+                    source.FileInfo.TimeAxis.StartDateTime
+                )
+
+            items, item_numbers, time_steps = get_valid_items_and_timesteps(
+                self, items, time_steps, source=source
+            )
+
+            # spatial dimensions as returned by read, e.g. [y,x] flipped in y
+            shape = tuple(counts[::-1])
+            flip = len(shape) > 1
+
+            if self._backend == "numpy":
+                times = source.time_in_seconds
+
+                def read_item_timestep(item, it, out):
+                    item_number = item_numbers[item]
+                    d = source.item_data(item_number)[it].reshape(shape)
+                    out[...] = np.flip(d, axis=0) if flip else d
+                    deletevalue = source.item_deletevalue(item_number)
+                    if deletevalue is not None:
+                        out[out == deletevalue] = np.nan
+                    return times[it]
+
+            else:
+                deletevalue = source.FileInfo.DeleteValueFloat
+                buffers = BufferPool()
+
+                def read_item_timestep(item, it, out):
+                    itemdata = source.ReadItemTimeStep(item_numbers[item] + 1, it)
+                    d = buffers.to_numpy(itemdata.Data, key=item).reshape(shape)
+                    d[d == deletevalue] = np.nan
+                    out[...] = np.flip(d, axis=0) if flip else d
+                    return itemdata.Time
+
+            shapes = [shape] * len(items)
+            yield from iter_timestep_blocks(
+                read_item_timestep,
+                items,
+                time_steps,
+                shapes,
+                start_time,
+                chunk,
+                dtype,
+            )
+        finally:
+            if self._backend == "numpy":
+                source.close()
+            else:
+                source.Close()
+
     def _write_handle_common_arguments(
         self, title, data, items, coordinate, start_time, dt
     ):
@@ -4,22 +4,26 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
-from DHI.Generic.MikeZero import eumQuantity
-from DHI.Generic.MikeZero.DFS import (
-    DfsFileFactory,
-    DfsFactory,
-    DfsBuilder,
-    DfsSimpleType,
-    DataValueType,
-    StatType,
+from .dotnet import (
+    LazyImport,
+    to_dotnet_array,
+    to_dotnet_datetime,
+    from_dotnet_datetime,
 )
-from DHI.Generic.MikeZero.DFS.dfs0 import Dfs0Util
-
-from .dotnet import to_dotnet_array, to_dotnet_datetime, from_dotnet_datetime
 from .dutil import Dataset, get_valid_items_and_timesteps
+from .dfs_raw import RawDfsFile, validate_backend
 from .eum import TimeStep, EUMType, EUMUnit, ItemInfo
 from .helpers import safe_length
 
+eumQuantity = LazyImport("DHI.Generic.MikeZero", "eumQuantity")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFactory")
+DfsBuilder = LazyImport("DHI.Generic.MikeZero.DFS", "DfsBuilder")
+DfsSimpleType = LazyImport("DHI.Generic.MikeZero.DFS", "DfsSimpleType")
+DataValueType = LazyImport("DHI.Generic.MikeZero.DFS", "DataValueType")
+StatType = LazyImport("DHI.Generic.MikeZero.DFS", "StatType")
+Dfs0Util = LazyImport("DHI.Generic.MikeZero.DFS.dfs0", "Dfs0Util")
+
 
 class Dfs0:
 
@@ -31,17 +35,21 @@ class Dfs0:
     _data_value_type = None
     _items = None
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, backend="dotnet"):
         """Create a Dfs0 object for reading, writing
 
         Parameters
         ----------
         filename: str, optional
             File name including full path to the dfs0 file.
+        backend: str, optional
+            "dotnet" (default) reads with the DHI .NET libraries,
+            "numpy" reads the file directly with numpy
         """
         self._filename = filename
+        self._backend = validate_backend(backend)
 
-    def read(self, items=None, time_steps=None):
+    def read(self, items=None, time_steps=None, dtype=np.float64):
         """
         Read data from a dfs0 file.
 
@@ -51,6 +59,8 @@ class Dfs0:
             Read only selected items, by number (0-based), or by name
         time_steps: int or list[int], optional
             Read only selected time_steps
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64
 
         Returns
         -------
@@ -61,6 +71,9 @@ class Dfs0:
         if not os.path.exists(self._filename):
             raise FileNotFoundError(f"File {self._filename} not found.")
 
+        if self._backend == "numpy":
+            return self.__read_numpy(items, time_steps, dtype)
+
         dfs = DfsFileFactory.DfsGenericOpen(self._filename)
         self._source = dfs
         self._n_items = safe_length(dfs.ItemInfo)
@@ -75,6 +88,9 @@ class Dfs0:
         if time_steps:
             ds = ds.isel(time_steps, axis=0)
 
+        if np.dtype(dtype) != np.float64:
+            ds.data = [d.astype(dtype) for d in ds.data]
+
         return ds
 
     def __read(self, filename):
@@ -99,6 +115,24 @@ class Dfs0:
 
         return Dataset(data, time, items)
 
+    def __read_numpy(self, items, time_steps, dtype):
+        raw = RawDfsFile(self._filename)
+        try:
+            self._n_items = raw.n_items
+            self._n_timesteps = raw.n_timesteps
+
+            items, item_numbers, time_steps = get_valid_items_and_timesteps(
+                self, items, time_steps, source=raw
+            )
+
+            data_list = raw.read(item_numbers, time_steps, dtype=dtype)
+            data = [d[:, 0] for d in data_list]
+            time = raw.get_time(time_steps)
+        finally:
+            raw.close()
+
+        return Dataset(data, time, items)
+
     def __to_numpy_with_nans(self, raw_data):
         data = np.fromiter(raw_data, np.float64).reshape(
             self._n_timesteps, self._n_items + 1
@@ -1,17 +1,9 @@
 import numpy as np
 from datetime import timedelta
 
-from DHI.Generic.MikeZero import eumUnit
-from DHI.Generic.MikeZero.DFS import (
-    DfsFileFactory,
-    DfsFactory,
-    DfsSimpleType,
-    DataValueType,
-)
-from DHI.Generic.MikeZero.DFS.dfs123 import Dfs1Builder
-
 from .dutil import Dataset, find_item, get_item_info, get_valid_items_and_timesteps
 from .dotnet import (
+    LazyImport,
     to_numpy,
     to_dotnet_float_array,
     to_dotnet_datetime,
@@ -20,25 +12,39 @@ from .dotnet import (
 from .eum import TimeStep, ItemInfo
 from .helpers import safe_length
 from .dfs import Dfs123
+from .dfs_raw import RawDfsFile
+
+eumUnit = LazyImport("DHI.Generic.MikeZero", "eumUnit")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFactory")
+Dfs1Builder = LazyImport("DHI.Generic.MikeZero.DFS.dfs123", "Dfs1Builder")
 
 
 class Dfs1(Dfs123):
 
+    _ndim = 1
     _dx = None
 
-    def __init__(self, filename=None):
-        super(Dfs1, self).__init__(filename)
+    def __init__(self, filename=None, backend="dotnet"):
+        super(Dfs1, self).__init__(filename, backend)
 
         if filename:
             self._read_dfs1_header()
 
     def _read_dfs1_header(self):
+        if self._backend == "numpy":
+            raw = RawDfsFile(self._filename)
+            self._dx = raw.item_axes[0].spacing[0]
+            self._read_raw_header(raw)
+            raw.close()
+            return
+
         dfs = DfsFileFactory.Dfs1FileOpen(self._filename)
         self._dx = dfs.SpatialAxis.Dx
 
         self._read_header(dfs)
 
-    def read(self, items=None, time_steps=None):
+    def read(self, items=None, time_steps=None, dtype=np.float64):
         """
         Read data from a dfs1 file
         
@@ -48,12 +54,19 @@ class Dfs1(Dfs123):
             Read only selected items, by number (0-based), or by name
         time_steps: int or list[int], optional
             Read only selected time_steps
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64.
+            The file stores single precision values, so np.float32
+            halves the memory use and avoids converting the values
 
         Returns
         -------
         Dataset
             A dataset with data dimensions [t,x]
         """
+        if self._backend == "numpy":
+            data_list, time, items = self._read_raw(items, time_steps, dtype)
+            return Dataset(data_list, time, items)
 
         # NOTE. Item numbers are base 0 (everything else in the dfs is base 0)
 
@@ -85,11 +98,14 @@ class Dfs1(Dfs123):
 
         for item in range(n_items):
             # Initialize an empty data block
-            data = np.ndarray(shape=(len(time_steps), xNum), dtype=float)
+            data = np.ndarray(shape=(len(time_steps), xNum), dtype=dtype)
             data_list.append(data)
 
         t_seconds = np.zeros(len(time_steps), dtype=float)
 
+        buffer = np.empty(xNum, dtype=np.float32)  # reused for all item-timesteps
+        copy_to_data = np.dtype(dtype) == np.float32
+
         for i in range(len(time_steps)):
             it = time_steps[i]
             for item in range(n_items):
@@ -97,12 +113,16 @@ class Dfs1(Dfs123):
                 itemdata = dfs.ReadItemTimeStep(item_numbers[item] + 1, it)
 
                 src = itemdata.Data
-                d = to_numpy(src)
-
-                d[d == deleteValue] = np.nan
-                data_list[item][it, :] = d
-
-            t_seconds[it] = itemdata.Time
+                if copy_to_data:
+                    # copy directly into the data block
+                    d = to_numpy(src, out=data_list[item][i])
+                    d[d == deleteValue] = np.nan
+                else:
+                    d = to_numpy(src, out=buffer)
+                    d[d == deleteValue] = np.nan
+                    data_list[item][i, :] = d
+
+            t_seconds[i] = itemdata.Time
 
         start_time = from_dotnet_datetime(dfs.FileInfo.TimeAxis.StartDateTime)
         time = [start_time + timedelta(seconds=tsec) for tsec in t_seconds]
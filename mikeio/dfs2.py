@@ -1,17 +1,8 @@
 import numpy as np
 from datetime import timedelta
-from DHI.Generic.MikeZero import eumUnit
-from DHI.Generic.MikeZero.DFS import (
-    DfsFileFactory,
-    DfsFactory,
-    DfsSimpleType,
-    DataValueType,
-)
-from DHI.Generic.MikeZero.DFS.dfs123 import Dfs2Builder
-from DHI.Projections import Cartography
-
 from .dutil import Dataset, get_item_info, get_valid_items_and_timesteps
 from .dotnet import (
+    LazyImport,
     to_numpy,
     to_dotnet_float_array,
     to_dotnet_datetime,
@@ -20,20 +11,38 @@ from .dotnet import (
 from .eum import TimeStep, ItemInfo
 from .helpers import safe_length
 from .dfs import Dfs123
+from .dfs_raw import RawDfsFile
+
+eumUnit = LazyImport("DHI.Generic.MikeZero", "eumUnit")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFactory")
+Dfs2Builder = LazyImport("DHI.Generic.MikeZero.DFS.dfs123", "Dfs2Builder")
+Cartography = LazyImport("DHI.Projections", "Cartography")
 
 
 class Dfs2(Dfs123):
 
+    _ndim = 2
     _dx = None
     _dy = None
+    _nx = None
+    _ny = None
 
-    def __init__(self, filename=None):
-        super(Dfs2, self).__init__(filename)
+    def __init__(self, filename=None, backend="dotnet"):
+        super(Dfs2, self).__init__(filename, backend)
 
         if filename:
             self._read_dfs2_header()
 
     def _read_dfs2_header(self):
+        if self._backend == "numpy":
+            raw = RawDfsFile(self._filename)
+            self._dx, self._dy = raw.item_axes[0].spacing
+            self._nx, self._ny = raw.item_axes[0].counts
+            self._read_raw_header(raw)
+            raw.close()
+            return
+
         dfs = DfsFileFactory.Dfs2FileOpen(self._filename)
         self._dx = dfs.SpatialAxis.Dx
         self._dy = dfs.SpatialAxis.Dy
@@ -71,6 +80,10 @@ class Dfs2(Dfs123):
 
         (int,int): indexes in y, x 
         """
+        if self._backend == "numpy":
+            raise NotImplementedError(
+                "find_nearest_element requires backend='dotnet'"
+            )
         projection = self._dfs.FileInfo.Projection
         axis = self._dfs.SpatialAxis
         cart = Cartography(
@@ -91,7 +104,7 @@ class Dfs2(Dfs123):
 
         return k, j
 
-    def read(self, items=None, time_steps=None):
+    def read(self, items=None, time_steps=None, dtype=np.float64):
         """
         Read data from a dfs2 file
         
@@ -101,12 +114,24 @@ class Dfs2(Dfs123):
             Read only selected items, by number (0-based), or by name
         time_steps: int or list[int], optional
             Read only selected time_steps
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64.
+            The file stores single precision values, so np.float32
+            halves the memory use and avoids converting the values
 
         Returns
         -------
         Dataset
             A dataset with data dimensions [t,y,x]
         """
+        if self._backend == "numpy":
+            data_list, time, items = self._read_raw(items, time_steps, dtype)
+            data_list = [
+                np.ascontiguousarray(d.reshape(-1, self._ny, self._nx)[:, ::-1, :])
+                for d in data_list
+            ]
+            return Dataset(data_list, time, items)
+
         dfs = DfsFileFactory.Dfs2FileOpen(self._filename)
         self._dfs = dfs
         self._source = dfs
@@ -135,11 +160,13 @@ class Dfs2(Dfs123):
         data_list = []
 
         for item in range(self._n_items):
-            data = np.ndarray(shape=(len(time_steps), yNum, xNum), dtype=float)
+            data = np.ndarray(shape=(len(time_steps), yNum, xNum), dtype=dtype)
             data_list.append(data)
 
         t_seconds = np.zeros(len(time_steps), dtype=float)
 
+        buffer = np.empty(yNum * xNum, dtype=np.float32)
+
         # startTime = dfs.FileInfo.TimeAxis.StartDateTime
         for i in range(len(time_steps)):
             it = time_steps[i]
@@ -148,7 +175,7 @@ class Dfs2(Dfs123):
                 itemdata = dfs.ReadItemTimeStep(item_numbers[item] + 1, it)
 
                 src = itemdata.Data
-                d = to_numpy(src)
+                d = to_numpy(src, out=buffer)
 
                 d = d.reshape(yNum, xNum)
                 d = np.flipud(d)
@@ -1,17 +1,9 @@
 import numpy as np
 from datetime import datetime, timedelta
-from DHI.Generic.MikeZero import eumUnit, eumQuantity
-from DHI.Generic.MikeZero.DFS import (
-    DfsFileFactory,
-    DfsFactory,
-    DfsSimpleType,
-    DataValueType,
-)
-from DHI.Generic.MikeZero.DFS.dfs123 import Dfs3Builder
-
 from .helpers import safe_length
-from .dutil import Dataset, get_item_info
+from .dutil import Dataset, create_data_block, get_item_info
 from .dotnet import (
+    LazyImport,
     to_numpy,
     to_dotnet_array,
     to_dotnet_float_array,
@@ -20,11 +12,23 @@ from .dotnet import (
 )
 from .eum import TimeStep
 from .dfs import Dfs123
+from .dfs_raw import RawDfsFile
+
+eumUnit = LazyImport("DHI.Generic.MikeZero", "eumUnit")
+eumQuantity = LazyImport("DHI.Generic.MikeZero", "eumQuantity")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFactory")
+DfsSimpleType = LazyImport("DHI.Generic.MikeZero.DFS", "DfsSimpleType")
+DataValueType = LazyImport("DHI.Generic.MikeZero.DFS", "DataValueType")
+Dfs3Builder = LazyImport("DHI.Generic.MikeZero.DFS.dfs123", "Dfs3Builder")
 
 
 class Dfs3(Dfs123):
-    def __init__(self, filename=None):
-        super(Dfs3, self).__init__(filename)
+
+    _ndim = 3
+
+    def __init__(self, filename=None, backend="dotnet"):
+        super(Dfs3, self).__init__(filename, backend)
 
     def __calculate_index(self, nx, ny, nz, x, y, z):
         """ Calculates the position in the dfs3 data array based on the
@@ -180,7 +184,15 @@ class Dfs3(Dfs123):
 
         return data
 
-    def read(self, item_numbers=None, layers=None, coordinates=None):
+    def read(
+        self,
+        item_numbers=None,
+        layers=None,
+        coordinates=None,
+        dtype=np.float64,
+        out=None,
+        scratch_dir=None,
+    ):
         """ Function: Read data from a dfs3 file
 
         Usage:
@@ -193,6 +205,14 @@ class Dfs3(Dfs123):
         coordinates
             list of list (x,y,layer) integers ( 0,0 at Bottom Left of Grid !! )
             example coordinates = [[2,5,1], [11,41,2]]
+        dtype
+            data type of the returned data, default np.float64.
+            np.float32 (the precision of the file) halves the memory use
+        out
+            None (default) reads the data into memory, "memmap" reads each
+            item into a disk-backed np.memmap (for data larger than memory)
+        scratch_dir
+            directory for the memmap scratch files, default the system temp directory
 
         Returns
             1) the data contained in a dfs3 file in a list of numpy matrices
@@ -206,6 +226,10 @@ class Dfs3(Dfs123):
             2) coordinates specified overules layers.
             3) layer counts from the bottom
         """
+        if self._backend == "numpy":
+            return self._read_numpy(
+                item_numbers, layers, coordinates, dtype, out, scratch_dir
+            )
 
         # Open the dfs file for reading
         dfs = DfsFileFactory.DfsGenericOpen(self._filename)
@@ -232,13 +256,11 @@ class Dfs3(Dfs123):
                 for item in range(n_items):
                     if layers is None:
                         # Initialize an empty data block
-                        data = np.ndarray(shape=(nt, zNum, yNum, xNum), dtype=float)
-                        data_list.append(data)
+                        shape = (nt, zNum, yNum, xNum)
                     else:
-                        data = np.ndarray(
-                            shape=(nt, len(layers), yNum, xNum), dtype=float
-                        )
-                        data_list.append(data)
+                        shape = (nt, len(layers), yNum, xNum)
+                    data = create_data_block(shape, dtype, out, scratch_dir)
+                    data_list.append(data)
 
             else:
                 raise ValueError(
@@ -249,19 +271,22 @@ class Dfs3(Dfs123):
             ncoordinates = len(coordinates)
             for item in range(n_items):
                 # Initialize an empty data block
-                data = np.ndarray(shape=(nt, ncoordinates), dtype=float)
+                shape = (nt, ncoordinates)
+                data = create_data_block(shape, dtype, out, scratch_dir)
                 data_list.append(data)
 
         t_seconds = np.zeros(nt, dtype=float)
         startTime = dfs.FileInfo.TimeAxis.StartDateTime
 
+        buffer = np.empty(zNum * yNum * xNum, dtype=np.float32)
+
         if coordinates is None:
             for it in range(nt):
                 for item in range(n_items):
                     itemdata = dfs.ReadItemTimeStep(item_numbers[item] + 1, it)
 
                     src = itemdata.Data
-                    d = to_numpy(src)
+                    d = to_numpy(src, out=buffer)
 
                     # DO a direct copy instead of eleement by elment
                     d = d.reshape(zNum, yNum, xNum)  # .swapaxes(0, 2).swapaxes(0, 1)
@@ -282,7 +307,7 @@ class Dfs3(Dfs123):
             for it in range(nt):
                 for item in range(n_items):
                     itemdata = dfs.ReadItemTimeStep(item_numbers[item] + 1, it)
-                    d = np.array([itemdata.Data[i] for i in indices])
+                    d = to_numpy(itemdata.Data, out=buffer)[indices]
                     d[d == deleteValue] = np.nan
                     data_list[item][it, :] = d
 
@@ -297,6 +322,36 @@ class Dfs3(Dfs123):
 
         return Dataset(data_list, time, items)
 
+    def _read_numpy(self, item_numbers, layers, coordinates, dtype, out, scratch_dir):
+        raw = RawDfsFile(self._filename)
+        xNum, yNum, zNum = raw.item_axes[0].counts
+        raw.close()
+
+        if coordinates is None:
+            # same layout as the dotnet read: z axis flipped, selected layers
+            index = np.arange(zNum * yNum * xNum).reshape(zNum, yNum, xNum)[::-1]
+            if layers is not None:
+                index = index[layers]
+        else:
+            index = np.array(
+                [
+                    self.__calculate_index(xNum, yNum, zNum, x, y, z)
+                    for x, y, z in coordinates
+                ]
+            )
+
+        data_list, time, items = self._read_raw(
+            item_numbers,
+            None,
+            dtype,
+            index=index.ravel(),
+            out=out,
+            scratch_dir=scratch_dir,
+        )
+        data_list = [d.reshape((-1,) + index.shape) for d in data_list]
+
+        return Dataset(data_list, time, items)
+
     def write(
         self,
         filename,
@@ -410,7 +465,9 @@ class Dfs3(Dfs123):
 
         for i in range(n_time_steps):
             for item in range(n_items):
-                d = data[item][i]
+                # copy of a single time step, so data (e.g. a memmap) is
+                # neither loaded nor modified
+                d = data[item][i].astype(np.float32)
                 d[np.isnan(d)] = deletevalue
                 d = np.flipud(d)
                 darray = to_dotnet_float_array(d.reshape(d.size, 1)[:, 0])
@@ -0,0 +1,399 @@
+"""Read dfs files directly with numpy (without the DHI .NET libraries)
+
+A dfs file starts with a short text header followed by a sequence of
+tagged blocks. A block is opened by the byte 0xFE and a 2-byte tag,
+contains a number of typed value arrays (1-byte type, 4-byte count, values)
+and is closed by the byte 0xFF. The header blocks describe the file,
+time axis, dynamic items, custom blocks and static items, and the
+dynamic data follows after the tag 50000 as one record per time step
+(tag 50001, optionally the time, then the values of each item).
+
+All records have the same size, so the dynamic data is memory mapped
+as an array of records and each item is available as a zero-copy
+view with dimensions [t, values].
+"""
+import os
+import struct
+from collections import namedtuple
+from copy import deepcopy
+from datetime import datetime, timedelta
+import numpy as np
+
+from .eum import EUMType, EUMUnit, ItemInfo, TimeStep
+
+_VALUE_TYPES = {
+    1: np.dtype("<f4"),
+    2: np.dtype("<f8"),
+    3: np.dtype("S1"),
+    4: np.dtype("<i4"),
+    5: np.dtype("<u4"),
+    6: np.dtype("<i2"),
+}
+
+_TAG_OPEN = 0xFE
+_TAG_CLOSE = 0xFF
+
+_TAG_FIRST = 10000
+_TAG_TITLE = 10001
+_TAG_DATA_TYPE = 10012
+_TAG_DELETE_FLOAT = 10006
+_TAG_DELETE_DOUBLE = 10007
+_TAG_PROJECTION = 10011
+_TAG_TIME_EQ_CALENDAR = 20053
+_TAG_TIME_NONEQ_CALENDAR = 20054
+_TAG_ITEM_INFO = 30005
+_TAG_AXIS_EQ_D0 = 31051
+_TAG_AXIS_EQ_D1 = 31052
+_TAG_AXIS_EQ_D2 = 31055
+_TAG_AXIS_EQ_D3 = 31058
+_TAG_STATIC_DATA = 40001
+_TAG_DYNAMIC_DATA = 50000
+_TAG_TIMESTEP = 50001
+_TAG_CUSTOM_BLOCK = 60000
+
+_AXIS_DIMENSIONS = {
+    _TAG_AXIS_EQ_D0: 0,
+    _TAG_AXIS_EQ_D1: 1,
+    _TAG_AXIS_EQ_D2: 2,
+    _TAG_AXIS_EQ_D3: 3,
+}
+
+_SECONDS_PER_UNIT = {
+    TimeStep.SECOND: 1.0,
+    TimeStep.MINUTE: 60.0,
+    TimeStep.HOUR: 3600.0,
+    TimeStep.DAY: 86400.0,
+}
+
+EqAxis = namedtuple("EqAxis", ["unit", "counts", "origin", "spacing"])
+EqAxis.__doc__ = """Equidistant spatial axis (counts, origin and spacing in x,y,z order)"""
+
+
+class RawDfsFile:
+    """Dfs file read directly with numpy
+
+    Parameters
+    ----------
+    filename: str
+        full path to the dfs file (dfs0, dfs1, dfs2, dfs3 or dfsu)
+
+    Notes
+    -----
+    Only files with a calendar time axis, equidistant spatial axes and
+    float or double items are supported.
+
+    Examples
+    --------
+    >>> raw = RawDfsFile("tests/testdata/HD2D.dfsu")
+    >>> raw.n_timesteps
+    9
+    >>> raw.item_data(0).shape
+    (9, 884)
+    """
+
+    def __init__(self, filename):
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(f"File {filename} not found.")
+
+        self._filename = filename
+        self._mm = np.memmap(filename, dtype=np.uint8, mode="r")
+
+        self.title = ""
+        self.data_type = 0
+        self.deletevalue = None
+        self.deletevalue_double = None
+        self.projection = None
+        self.start_time = None
+        self.time_unit = TimeStep.SECOND
+        self.is_equidistant = True
+        self._start_offset = 0.0
+        self._timestep = 0.0
+        self._n_timesteps_header = 0
+
+        self.items = []
+        self.item_axes = []
+        self._item_dtypes = []
+        self.static_items = {}
+        self.custom_blocks = {}
+
+        self._parse_header()
+        self._map_dynamic_data()
+
+    def __repr__(self):
+        return f"RawDfsFile({self._filename})"
+
+    def _read_block(self, pos):
+        """Read tagged block at pos, returns tag, list of values and end pos"""
+        mm = self._mm
+        if mm[pos] != _TAG_OPEN:
+            raise ValueError(f"Invalid dfs file {self._filename}: no tag at {pos}")
+        tag = struct.unpack("<H", mm[pos + 1 : pos + 3].tobytes())[0]
+        pos = pos + 3
+        values = []
+        while mm[pos] != _TAG_CLOSE:
+            value_type = int(mm[pos])
+            count = struct.unpack("<i", mm[pos + 1 : pos + 5].tobytes())[0]
+            pos = pos + 5
+            if value_type not in _VALUE_TYPES:
+                raise ValueError(
+                    f"Value type {value_type} in {self._filename} is not supported"
+                )
+            dtype = _VALUE_TYPES[value_type]
+            nbytes = count * dtype.itemsize
+            value = np.frombuffer(mm, dtype=dtype, count=count, offset=pos)
+            if value_type == 3:
+                value = value.tobytes().split(b"\0")[0].decode("latin-1")
+            values.append(value)
+            pos = pos + nbytes
+        return tag, values, pos + 1
+
+    def _parse_header(self):
+        mm = self._mm
+        first = struct.pack("<BH", _TAG_OPEN, _TAG_FIRST)
+        pos = mm[:4096].tobytes().find(first)
+        if pos < 0:
+            raise ValueError(f"{self._filename} is not a dfs file")
+
+        item_info = None
+        static_axis = None
+        in_static = False
+        while True:
+            tag, values, pos = self._read_block(pos)
+
+            if tag == _TAG_TITLE:
+                self.title = values[0]
+            elif tag == _TAG_DATA_TYPE:
+                self.data_type = int(values[0][0])
+            elif tag == _TAG_DELETE_FLOAT:
+                self.deletevalue = float(values[0][0])
+            elif tag == _TAG_DELETE_DOUBLE:
+                self.deletevalue_double = float(values[0][0])
+            elif tag == _TAG_PROJECTION:
+                wkt = values[0]
+                lon, lat, orientation = values[1]
+                self.projection = (wkt, float(lon), float(lat), float(orientation))
+            elif tag in (_TAG_TIME_EQ_CALENDAR, _TAG_TIME_NONEQ_CALENDAR):
+                self._set_time_axis(tag, values)
+            elif 20000 < tag < 30000:
+                raise NotImplementedError(
+                    "Only calendar time axes are supported by the numpy backend"
+                )
+            elif tag == _TAG_ITEM_INFO:
+                item_info = values
+            elif tag in _AXIS_DIMENSIONS:
+                axis = self._create_axis(tag, values)
+                if in_static:
+                    static_axis = axis
+                else:
+                    self._add_item(item_info, axis)
+            elif 31000 < tag < 32000:
+                raise NotImplementedError(
+                    "Only equidistant spatial axes are supported by the numpy backend"
+                )
+            elif tag == 40000:
+                in_static = True
+            elif tag == _TAG_STATIC_DATA:
+                name = item_info[1]
+                data = np.array(values[0])
+                if static_axis is not None and static_axis.counts:
+                    data = data.reshape(static_axis.counts[::-1])
+                self.static_items[name] = data
+            elif tag == _TAG_CUSTOM_BLOCK:
+                self.custom_blocks[values[0]] = np.array(values[1])
+            elif tag == _TAG_DYNAMIC_DATA:
+                self._data_offset = pos
+                break
+
+    def _set_time_axis(self, tag, values):
+        date, time = values[0], values[1]
+        self.start_time = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
+        self.time_unit = TimeStep(int(values[2][0]))
+        if self.time_unit not in _SECONDS_PER_UNIT:
+            raise NotImplementedError(
+                f"Time unit {self.time_unit.name} is not supported by the numpy backend"
+            )
+        self._start_offset = float(values[3][0])
+        self._timestep = float(values[3][1])
+        self._n_timesteps_header = int(values[4][0])
+        self.is_equidistant = tag == _TAG_TIME_EQ_CALENDAR
+
+    @staticmethod
+    def _create_axis(tag, values):
+        ndim = _AXIS_DIMENSIONS[tag]
+        unit = int(values[0][0])
+        if ndim == 0:
+            return EqAxis(unit, (), (), ())
+        counts = tuple(int(n) for n in values[0][1 : ndim + 1])
+        origin = tuple(float(x) for x in values[1][:ndim])
+        spacing = tuple(float(dx) for dx in values[1][ndim:])
+        return EqAxis(unit, counts, origin, spacing)
+
+    def _add_item(self, item_info, axis):
+        quantity, name, unit, data_type = item_info[:4]
+        dtype = _VALUE_TYPES[int(data_type[0])]
+        if dtype.kind != "f":
+            raise NotImplementedError(
+                f"Item {name}: only float and double items are supported"
+            )
+        item = ItemInfo(name, EUMType(int(quantity[0])), EUMUnit(int(unit[0])))
+        self.items.append(item)
+        self.item_axes.append(axis)
+        self._item_dtypes.append(dtype)
+
+    def _record_dtype(self):
+        fields = [("tag", "u1", (3,))]
+        if not self.is_equidistant:
+            fields.append(("time_header", "u1", (5,)))
+            fields.append(("time", "<f8"))
+        fields.append(("tag_close", "u1"))
+        for i in range(self.n_items):
+            fields.append((f"header{i}", "u1", (5,)))
+            fields.append((f"item{i}", self._item_dtypes[i], (self.item_size(i),)))
+        return np.dtype(fields)
+
+    def _map_dynamic_data(self):
+        dtype = self._record_dtype()
+        n_bytes = self._mm.size - self._data_offset
+        # file may be incomplete while a simulation is writing to it
+        nt = min(self._n_timesteps_header, n_bytes // dtype.itemsize)
+        if nt == 0:
+            self._records = np.zeros(0, dtype=dtype)
+            return
+
+        self._records = np.memmap(
+            self._filename, dtype=dtype, mode="r", offset=self._data_offset, shape=(nt,)
+        )
+        first = self._records[0]
+        tag = struct.pack("<BH", _TAG_OPEN, _TAG_TIMESTEP)
+        if first["tag"].tobytes() != tag or first["tag_close"] != _TAG_CLOSE:
+            raise ValueError(f"Unexpected dynamic data layout in {self._filename}")
+        for i in range(self.n_items):
+            count = struct.unpack("<i", first[f"header{i}"][1:].tobytes())[0]
+            if count != self.item_size(i):
+                raise ValueError(f"Unexpected dynamic data layout in {self._filename}")
+
+    @property
+    def n_items(self):
+        """Number of dynamic items"""
+        return len(self.items)
+
+    @property
+    def n_timesteps(self):
+        """Number of time steps available in the file"""
+        return len(self._records)
+
+    def item_size(self, item):
+        """Number of values of item in each time step"""
+        return int(np.prod(self.item_axes[item].counts, dtype=int))
+
+    @property
+    def time_in_seconds(self):
+        """Time of each time step in seconds relative to start_time"""
+        factor = _SECONDS_PER_UNIT[self.time_unit]
+        if self.is_equidistant:
+            steps = np.arange(self.n_timesteps)
+            return factor * (self._start_offset + self._timestep * steps)
+        return factor * np.asarray(self._records["time"], dtype=np.float64)
+
+    @property
+    def timestep(self):
+        """Time step in seconds (equidistant files)"""
+        return _SECONDS_PER_UNIT[self.time_unit] * self._timestep
+
+    def get_time(self, time_steps=None):
+        """List of datetimes for the selected time steps"""
+        t_seconds = self.time_in_seconds
+        if time_steps is not None:
+            t_seconds = t_seconds[time_steps]
+        return [self.start_time + timedelta(seconds=float(t)) for t in t_seconds]
+
+    def get_item_info(self, item_numbers):
+        """List of ItemInfo for the selected items"""
+        return [deepcopy(self.items[i]) for i in item_numbers]
+
+    def item_data(self, item):
+        """Zero-copy view of all values of an item
+
+        Parameters
+        ----------
+        item: int
+            item number (0-based)
+
+        Returns
+        -------
+        np.memmap
+            read-only data with dimensions [t, values] (delete values not masked)
+        """
+        return self._records[f"item{item}"]
+
+    def read_item_timestep(self, item, time_step):
+        """Zero-copy view of the values of an item in a single time step"""
+        return self.item_data(item)[time_step]
+
+    def item_deletevalue(self, item):
+        """Delete value of an item (depends on the item data type)"""
+        if self._item_dtypes[item] == np.float64:
+            return self.deletevalue_double
+        if self.deletevalue is None:
+            return None
+        return np.float32(self.deletevalue)
+
+    def read(
+        self, item_numbers, time_steps, dtype=np.float64, index=None, out=None
+    ):
+        """Read items with delete values replaced by NaN
+
+        Parameters
+        ----------
+        item_numbers: list[int]
+            items to read (0-based)
+        time_steps: list[int]
+            time steps to read
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64
+        index: dict, optional
+            item number -> array of value indices to read (default all values)
+        out: list[np.array], optional
+            preallocated arrays [t, values] for each item to read into,
+            e.g. disk-backed np.memmap arrays
+
+        Returns
+        -------
+        list[np.array]
+            data with dimensions [t, values] for each item
+        """
+        data_list = []
+        for i_item, item in enumerate(item_numbers):
+            src = self.item_data(item)
+            idx = None if index is None else index.get(item)
+            n = src.shape[1] if idx is None else len(idx)
+            if out is None:
+                data = np.empty((len(time_steps), n), dtype=dtype)
+            else:
+                data = out[i_item]
+            deletevalue = self.item_deletevalue(item)
+            for i, it in enumerate(time_steps):
+                d = data[i]
+                if idx is None:
+                    d[:] = src[it]
+                else:
+                    d[:] = src[it, idx]
+                if deletevalue is not None:
+                    d[d == deletevalue] = np.nan
+            data_list.append(data)
+        return data_list
+
+    def close(self):
+        """Release the memory mapped file"""
+        self._records = None
+        self._mm = None
+
+
+BACKENDS = ("dotnet", "numpy")
+
+
+def validate_backend(backend):
+    """Check that backend is one of the supported read backends"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Valid backends are {BACKENDS}")
+    return backend
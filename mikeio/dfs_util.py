@@ -1,5 +1,7 @@
-from DHI.Generic.MikeZero import EUMWrapper
 import numpy as np
+from .dotnet import LazyImport
+
+EUMWrapper = LazyImport("DHI.Generic.MikeZero", "EUMWrapper")
 
 
 def type_list(search=None):
@@ -1,30 +1,49 @@
 import os
+import hashlib
+import json
+import shutil
+import tempfile
 from enum import IntEnum
 import warnings
+import weakref
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.cm as cm
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
-from matplotlib.collections import PatchCollection
-
-from DHI.Generic.MikeZero import eumUnit, eumQuantity
-from DHI.Generic.MikeZero.DFS import DfsFileFactory, DfsFactory
-from DHI.Generic.MikeZero.DFS.dfsu import DfsuFile, DfsuFileType, DfsuBuilder, DfsuUtil
-from DHI.Generic.MikeZero.DFS.mesh import MeshFile, MeshBuilder
-
-from .dutil import Dataset, get_item_info, get_valid_items_and_timesteps
+from .dutil import (
+    Dataset,
+    create_data_block,
+    get_item_info,
+    get_valid_items_and_timesteps,
+    iter_timestep_blocks,
+    SubsetPlan,
+)
 from .dotnet import (
+    LazyImport,
+    BufferPool,
     to_numpy,
+    to_numpy_subset,
+    to_numpy_jagged,
+    to_dotnet_jagged,
     to_dotnet_float_array,
     to_dotnet_datetime,
     from_dotnet_datetime,
     asNumpyArray,
     to_dotnet_array,
-    asnetarray_v2,
 )
 from .eum import TimeStep, ItemInfo, EUMType, EUMUnit
 from .helpers import safe_length
+from .dfs_raw import RawDfsFile, validate_backend
+from .spatial import BoxBuckets, points_in_polygon
+
+eumUnit = LazyImport("DHI.Generic.MikeZero", "eumUnit")
+eumQuantity = LazyImport("DHI.Generic.MikeZero", "eumQuantity")
+DfsFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFactory")
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsuFile = LazyImport("DHI.Generic.MikeZero.DFS.dfsu", "DfsuFile")
+DfsuFileType = LazyImport("DHI.Generic.MikeZero.DFS.dfsu", "DfsuFileType")
+DfsuBuilder = LazyImport("DHI.Generic.MikeZero.DFS.dfsu", "DfsuBuilder")
+DfsuUtil = LazyImport("DHI.Generic.MikeZero.DFS.dfsu", "DfsuUtil")
+MeshFile = LazyImport("DHI.Generic.MikeZero.DFS.mesh", "MeshFile")
+MeshBuilder = LazyImport("DHI.Generic.MikeZero.DFS.mesh", "MeshBuilder")
 
 
 class UnstructuredType(IntEnum):
@@ -47,6 +66,77 @@ class UnstructuredType(IntEnum):
     Dfsu3DSigmaZ = 5
 
 
+def _element_table_to_csr(element_table):
+    """Convert list of node lists to connectivity and offsets (CSR format)"""
+    counts = np.fromiter(
+        (len(nodes) for nodes in element_table), dtype=np.int64, count=len(element_table)
+    )
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    connectivity = np.fromiter(
+        (nd for nodes in element_table for nd in nodes),
+        dtype=np.int32,
+        count=int(offsets[-1]),
+    )
+    return connectivity, offsets
+
+
+def _csr_take(connectivity, offsets, elements, node_layers="all"):
+    """Connectivity and offsets (CSR format) of a subset of elements
+
+    Parameters
+    ----------
+    connectivity : np.array(int32)
+        node ids of all elements
+    offsets : np.array(int64)
+        start of each element in connectivity (n_elements + 1 values)
+    elements : np.array(int)
+        element ids to take
+    node_layers : str, optional
+        'all' nodes, or the 'bottom' or 'top' half of the nodes
+        of each (3D) element, by default 'all'
+
+    Returns
+    -------
+    np.array(int32)
+        node ids of the selected elements
+    np.array(int64)
+        offsets of the selected elements
+    """
+    elements = np.asarray(elements, dtype=np.int64)
+    starts = offsets[elements]
+    counts = offsets[elements + 1] - starts
+    if node_layers == "bottom":
+        counts = counts // 2
+    elif node_layers == "top":
+        half = counts // 2
+        starts = starts + half
+        counts = counts - half
+    new_offsets = np.zeros(len(elements) + 1, dtype=np.int64)
+    np.cumsum(counts, out=new_offsets[1:])
+    idx = np.repeat(starts - new_offsets[:-1], counts)
+    idx += np.arange(new_offsets[-1], dtype=np.int64)
+    return connectivity[idx], new_offsets
+
+
+def _wrap_negative_ids(ids, n):
+    """Ids as array with negative ids counted from the end (like numpy indexing)"""
+    ids = np.asarray(ids, dtype=np.int64)
+    return np.where(ids < 0, ids + n, ids)
+
+
+def _csr_to_padded(connectivity, offsets, fill=-1):
+    """Element table as 2d array [elements, max nodes] padded with fill"""
+    counts = np.diff(offsets)
+    n_elements = len(counts)
+    width = int(counts.max()) if n_elements > 0 else 0
+    padded = np.full((n_elements, width), fill, dtype=connectivity.dtype)
+    rows = np.repeat(np.arange(n_elements), counts)
+    cols = np.arange(len(connectivity)) - np.repeat(offsets[:-1], counts)
+    padded[rows, cols] = connectivity
+    return padded
+
+
 class _UnstructuredGeometry:
     # THIS CLASS KNOWS NOTHING ABOUT MIKE FILES!
     _type = None  # -1: mesh, 0: 2d-dfsu, 4:dfsu3dsigma, ...
@@ -62,6 +152,17 @@ class _UnstructuredGeometry:
     _node_ids = None
     _element_table = None
     _element_table_dotnet = None
+    _connectivity = None  # node ids of all elements (int32, 0-based)
+    _offsets = None  # start of each element in _connectivity (int64)
+    _element_area = None
+    _spatial_index = None
+    _bucket_index = None
+    _cell_to_node = None
+    _polygon_vertices = None
+    _tri_only = None
+    _plot_collection = None
+    _node_elements = None
+    _faces = None
 
     _top_elems = None
     _n_layers_column = None
@@ -73,6 +174,7 @@ class _UnstructuredGeometry:
     _e2_e3_table = None
     _2d_ids = None
     _layer_ids = None
+    _column_offsets = None
 
     def __repr__(self):
         out = []
@@ -155,20 +257,40 @@ class _UnstructuredGeometry:
     def element_table(self):
         """Element to node connectivity
         """
-        if (self._element_table is None) and (self._element_table_dotnet is not None):
-            self._element_table = self._get_element_table_from_dotnet()
+        if self._element_table is None:
+            connectivity, offsets = self._get_connectivity()
+            if connectivity is not None:
+                self._element_table = [
+                    nodes.tolist() for nodes in np.split(connectivity, offsets[1:-1])
+                ]
         return self._element_table
 
+    def _get_connectivity(self):
+        """Element table in compressed (CSR) format
+
+        Returns
+        -------
+        np.array(int32)
+            node ids (0-based) of all elements, one element after the other
+        np.array(int64)
+            start of each element in the node ids (n_elements + 1 values)
+        """
+        if self._connectivity is None:
+            if self._element_table_dotnet is not None:
+                res = self._get_connectivity_from_dotnet()
+            elif self._element_table is not None:
+                res = _element_table_to_csr(self._element_table)
+            else:
+                return None, None
+            self._connectivity, self._offsets = res
+        return self._connectivity, self._offsets
+
     @property
     def max_nodes_per_element(self):
         """The maximum number of nodes for an element
         """
-        maxnodes = 0
-        for local_nodes in self.element_table:
-            n = len(local_nodes)
-            if n > maxnodes:
-                maxnodes = n
-        return maxnodes
+        _, offsets = self._get_connectivity()
+        return int(np.diff(offsets).max())
 
     @property
     def is_2d(self):
@@ -203,25 +325,16 @@ class _UnstructuredGeometry:
             return nc[self.codes == code]
         return nc
 
-    def _get_element_table_from_dotnet(self):
-        # Note: this can tak 10-20 seconds for large dfsu3d!
-        elem_tbl = []
-        for j in range(self.n_elements):
-            elem_nodes = list(self._element_table_dotnet[j])
-            elem_nodes = [nd - 1 for nd in elem_nodes]  # make 0-based
-            elem_tbl.append(elem_nodes)
-        return elem_tbl
-
-    def _element_table_to_dotnet(self, elem_table=None):
-        if elem_table is None:
-            elem_table = self._element_table
-        new_elem_table = []
-        n_elements = len(elem_table)
-        for j in range(n_elements):
-            elem_nodes = elem_table[j]
-            elem_nodes = [nd + 1 for nd in elem_nodes]  # make 1-based
-            new_elem_table.append(elem_nodes)
-        return asnetarray_v2(new_elem_table)
+    def _get_connectivity_from_dotnet(self):
+        connectivity, offsets = to_numpy_jagged(self._element_table_dotnet)
+        return connectivity - 1, offsets  # make 0-based
+
+    def _element_table_to_dotnet(self):
+        if self._element_table_dotnet is not None:
+            # unchanged table from the source file
+            return self._element_table_dotnet
+        connectivity, offsets = self._get_connectivity()
+        return to_dotnet_jagged(connectivity + 1, offsets)  # make 1-based
 
     def _set_nodes(
         self, node_coordinates, codes=None, node_ids=None, projection_string=None
@@ -239,8 +352,18 @@ class _UnstructuredGeometry:
         self._projstr = projection_string
 
     def _set_elements(self, element_table, element_ids=None, geometry_type=None):
+        connectivity, offsets = _element_table_to_csr(element_table)
+        self._set_connectivity(connectivity, offsets, element_ids, geometry_type)
         self._element_table = element_table
-        self._n_elements = len(element_table)
+
+    def _set_connectivity(
+        self, connectivity, offsets, element_ids=None, geometry_type=None
+    ):
+        self._connectivity = np.asarray(connectivity, dtype=np.int32)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._element_table = None
+        self._element_table_dotnet = None
+        self._n_elements = len(offsets) - 1
         if element_ids is None:
             element_ids = list(range(self.n_elements))
         self._element_ids = np.asarray(element_ids)
@@ -253,20 +376,6 @@ class _UnstructuredGeometry:
                 geometry_type = UnstructuredType.Dfsu3DSigma
         self._type = geometry_type
 
-    def _reindex(self):
-        new_node_ids = range(self.n_nodes)
-        new_element_ids = range(self.n_elements)
-        node_dict = dict(zip(self.node_ids, new_node_ids))
-        for j in range(self.n_elements):
-            elem_nodes = self._element_table[j]
-            new_elem_nodes = []
-            for idx in elem_nodes:
-                new_elem_nodes.append(node_dict[idx])
-            self._element_table[j] = new_elem_nodes
-
-        self._node_ids = np.array(list(new_node_ids))
-        self._element_ids = np.array(list(new_element_ids))
-
     def _get_element_table_for_elements(self, elements):
         return [self.element_table[j] for j in elements]
 
@@ -289,22 +398,7 @@ class _UnstructuredGeometry:
         elements = np.sort(elements)  # make sure elements are sorted!
 
         # extract information for selected elements
-        node_ids, elem_tbl = self._get_nodes_and_table_for_elements(
-            elements, node_layers=node_layers
-        )
-        node_coords = self.node_coordinates[node_ids]
-        codes = self.codes[node_ids]
-
-        # create new geometry
-        geom = _UnstructuredGeometry()
-        geom._set_nodes(
-            node_coords,
-            codes=codes,
-            node_ids=node_ids,
-            projection_string=self.projection_string,
-        )
-        geom._set_elements(elem_tbl, self.element_ids[elements])
-        geom._reindex()
+        geom = self._get_geometry_for_elements(elements, node_layers=node_layers)
 
         geom._type = self._type  #
         if not self.is_2d:
@@ -345,25 +439,48 @@ class _UnstructuredGeometry:
         return geom
 
     def _get_top_elements_from_coordinates(self, ec=None):
-        """Get list of top element ids based on element coordinates        
+        """Get list of top element ids based on element coordinates
+
+        The elements of a layered geometry are ordered column by column
+        from the bottom up, so a new column starts where the horizontal
+        position of the element centre changes, and the element before
+        it (as well as the last element) is a top element.
+
+        Parameters
+        ----------
+        ec : np.array, optional
+            element coordinates, default: element_coordinates
+
+        Returns
+        -------
+        np.array(int)
+            top element ids
         """
         if ec is None:
             ec = self.element_coordinates
 
         d_eps = 1e-4
-        top_elems = []
-        x_old = ec[0, 0]
-        y_old = ec[0, 1]
-        for j in range(1, len(ec)):
-            d2 = (ec[j, 0] - x_old) ** 2 + (ec[j, 1] - y_old) ** 2
-            # print(d2)
-            if d2 > d_eps:
-                # this is a new x,y point
-                # then the previous element must be a top element
-                top_elems.append(j - 1)
-            x_old = ec[j, 0]
-            y_old = ec[j, 1]
-        return np.array(top_elems)
+        d2 = np.diff(ec[:, 0]) ** 2 + np.diff(ec[:, 1]) ** 2
+        is_top = np.ones(len(ec), dtype=bool)
+        is_top[:-1] = d2 > d_eps
+        return np.flatnonzero(is_top)
+
+    def _find_top_layer_elements(self):
+        """Get list of top element ids based on the element table
+
+        The elements of a column are stored from the bottom up, and the
+        bottom face (first half of the nodes) of an element is the top
+        face (second half of the nodes) of the element below it
+        """
+        connectivity, offsets = self._get_connectivity()
+        n = self.n_elements
+        bottom = _csr_take(connectivity, offsets, np.arange(n), "bottom")
+        top = _csr_take(connectivity, offsets, np.arange(n), "top")
+        bottom_faces = np.sort(_csr_to_padded(*bottom), axis=1)
+        top_faces = np.sort(_csr_to_padded(*top), axis=1)
+        is_top = np.ones(n, dtype=bool)
+        is_top[:-1] = np.any(top_faces[:-1] != bottom_faces[1:], axis=1)
+        return np.flatnonzero(is_top)
 
     def to_2d_geometry(self):
         """extract 2d geometry from 3d geometry
@@ -379,28 +496,40 @@ class _UnstructuredGeometry:
 
         # extract information for selected elements
         elem_ids = self.bottom_elements
-        node_ids, elem_tbl = self._get_nodes_and_table_for_elements(
-            elem_ids, node_layers="bottom"
-        )
-        node_coords = self.node_coordinates[node_ids]
-        codes = self.codes[node_ids]
+        geom = self._get_geometry_for_elements(elem_ids, node_layers="bottom")
+
+        geom._type = UnstructuredType.Mesh
+
+        return geom
+
+    def _get_geometry_for_elements(self, elements, node_layers="all"):
+        """New geometry with the selected elements and their nodes
+
+        The nodes and elements of the new geometry are numbered from 0
+        in the order of the original ids.
+        """
+        node_layers = self._check_node_layers(node_layers)
+        connectivity, offsets = self._get_connectivity()
+        connectivity, offsets = _csr_take(connectivity, offsets, elements, node_layers)
+        node_ids, connectivity = np.unique(connectivity, return_inverse=True)
 
-        # create new geometry
         geom = _UnstructuredGeometry()
         geom._set_nodes(
-            node_coords,
-            codes=codes,
-            node_ids=node_ids,
+            self.node_coordinates[node_ids],
+            codes=self.codes[node_ids],
+            node_ids=np.arange(len(node_ids)),
             projection_string=self.projection_string,
         )
-        geom._set_elements(elem_tbl, self.element_ids[elem_ids])
-
-        geom._type = UnstructuredType.Mesh
-
-        geom._reindex()
-
+        geom._set_connectivity(connectivity.ravel(), offsets)
         return geom
 
+    def _check_node_layers(self, node_layers):
+        if (node_layers is None) or self.is_2d:
+            return "all"
+        if node_layers not in ("all", "bottom", "top"):
+            raise Exception("node_layers must be either all, bottom or top")
+        return node_layers
+
     def _get_nodes_and_table_for_elements(self, elements, node_layers="all"):
         """list of nodes and element table for a list of elements
 
@@ -416,34 +545,14 @@ class _UnstructuredGeometry:
         -------
         np.array(int)
             array of node ids (unique)
-        list(list(int))
-            element table with a list of nodes for each element
-        """
-        nodes = []
-        elem_tbl = []
-        if (node_layers is None) or (node_layers == "all") or self.is_2d:
-            for j in elements:
-                elem_nodes = self.element_table[j]
-                elem_tbl.append(elem_nodes)
-                for node in elem_nodes:
-                    nodes.append(node)
-        else:
-            # 3D file
-            if (node_layers != "bottom") and (node_layers != "top"):
-                raise Exception("node_layers must be either all, bottom or top")
-            for j in elements:
-                elem_nodes = self.element_table[j]
-                nn = len(elem_nodes)
-                halfn = int(nn / 2)
-                if node_layers == "bottom":
-                    elem_nodes = elem_nodes[:halfn]
-                if node_layers == "top":
-                    elem_nodes = elem_nodes[halfn:]
-                elem_tbl.append(elem_nodes)
-                for node in elem_nodes:
-                    nodes.append(node)
-
-        return np.unique(nodes), elem_tbl
+        tuple(np.array(int32), np.array(int64))
+            element table (connectivity and offsets) of the elements
+        """
+        node_layers = self._check_node_layers(node_layers)
+        connectivity, offsets = self._get_connectivity()
+        elem_tbl = _csr_take(connectivity, offsets, elements, node_layers)
+
+        return np.unique(elem_tbl[0]), elem_tbl
 
     @property
     def element_coordinates(self):
@@ -460,35 +569,60 @@ class _UnstructuredGeometry:
         np.array
             x,y,z of each element
         """
-        n_elements = self.n_elements
+        connectivity, offsets = self._get_connectivity()
+        nnodes_per_elem = np.diff(offsets)
 
-        ec = np.empty([n_elements, 3])
+        # sum the node coordinates of each element in one go
+        # (works for any mix of element types)
+        node_xyz = self._nc[connectivity]
+        ec = np.add.reduceat(node_xyz, offsets[:-1], axis=0, dtype=np.float64)
+        ec /= nnodes_per_elem[:, np.newaxis]
+
+        self._ec = ec
+        return ec
 
-        # pre-allocate for speed
-        maxnodes = self.max_nodes_per_element
-        idx = np.zeros(maxnodes, dtype=np.int)
-        xcoords = np.zeros([maxnodes, n_elements])
-        ycoords = np.zeros([maxnodes, n_elements])
-        zcoords = np.zeros([maxnodes, n_elements])
-        nnodes_per_elem = np.zeros(n_elements)
+    def _get_spatial_index(self):
+        """KD-tree of the horizontal element centres (built on first use)
+        """
+        if self._spatial_index is None:
+            from scipy.spatial import cKDTree
 
-        for j in range(n_elements):
-            nodes = self._element_table[j]
-            nnodes = len(nodes)
-            nnodes_per_elem[j] = nnodes
-            for i in range(nnodes):
-                idx[i] = nodes[i]  # - 1
+            ec = self.element_coordinates
+            self._spatial_index = cKDTree(self._to_index_coords(ec[:, 0], ec[:, 1]))
+        return self._spatial_index
 
-            xcoords[:nnodes, j] = self._nc[idx[:nnodes], 0]
-            ycoords[:nnodes, j] = self._nc[idx[:nnodes], 1]
-            zcoords[:nnodes, j] = self._nc[idx[:nnodes], 2]
+    def _to_index_coords(self, x, y):
+        """Coordinates of points in the spatial index
 
-        ec[:, 0] = np.sum(xcoords, axis=0) / nnodes_per_elem
-        ec[:, 1] = np.sum(ycoords, axis=0) / nnodes_per_elem
-        ec[:, 2] = np.sum(zcoords, axis=0) / nnodes_per_elem
+        x,y for projected coordinates and points on the unit sphere for
+        geographical coordinates (the straight line distance on the unit
+        sphere increases monotonically with the great circle distance)
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if not self.is_geo:
+            return np.column_stack([x, y])
+        lon = np.deg2rad(x)
+        lat = np.deg2rad(y)
+        return np.column_stack(
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+        )
 
-        self._ec = ec
-        return ec
+    def _find_n_nearest_2d_elements(self, x, y, n=1):
+        """Find n nearest 2d elements for each of the points given
+
+        Returns
+        -------
+        np.array
+            element ids, dimension [points] for n=1 else [points, n]
+        """
+        if self.is_2d:
+            geometry = self
+        else:
+            geometry = self.geometry2d
+        tree = geometry._get_spatial_index()
+        _, idx = tree.query(geometry._to_index_coords(x, y), k=n)
+        return idx
 
     def _find_n_nearest_elements(self, x, y, z=None, n=1, layer=None):
         """Find n nearest elements (for each of the points given) 
@@ -511,38 +645,31 @@ class _UnstructuredGeometry:
         np.array
             element ids of nearest element(s)            
         """
-        ec = self.element_coordinates
-
         if self.is_2d:
-            poi = np.array([x, y])
-
-            d = ((ec[:, 0:2] - poi) ** 2).sum(axis=1)
-            idx = d.argsort()[0:n]
+            idx = self._find_n_nearest_2d_elements(x, y, n=n)
         else:
-            poi = np.array([x, y])
-
-            ec = self.geometry2d.element_coordinates
-            d2d = ((ec[:, 0:2] - poi) ** 2).sum(axis=1)
-            elem2d = d2d.argsort()[0:n]  # n nearest 2d elements
+            # 3d: nearest column, then the element in the column
+            elem2d = self._find_n_nearest_2d_elements(x, y, n=1)
+            top = self.top_elements[elem2d]
+            bot = self.bottom_elements[elem2d]
 
             if layer is None:
-                # TODO: loop over 2d elements, to get n lateral 3d neighbors
-                elem3d = self.e2_e3_table[elem2d[0]]
-                zc = self.element_coordinates[elem3d, 2]
-
                 if z is None:
                     z = 0  # should we rarther return whole column?
-                d3d = np.abs(z - zc)
-                idx = elem3d[d3d.argsort()[0]]
+                z = np.broadcast_to(np.asarray(z, dtype=np.float64), top.shape)
+                # candidate elements of each column from bottom to top
+                cand = bot[:, np.newaxis] + np.arange(self.n_layers)
+                valid = cand <= top[:, np.newaxis]
+                cand = np.where(valid, cand, top[:, np.newaxis])
+                zc = self.element_coordinates[cand, 2]
+                d3d = np.where(valid, np.abs(z[:, np.newaxis] - zc), np.inf)
+                idx = cand[np.arange(len(cand)), d3d.argmin(axis=1)]
             else:
-                # 3d elements for n nearest 2d elements
-                elem3d = self.e2_e3_table[elem2d]
-                elem3d = np.concatenate(elem3d, axis=0)
-                layer_ids = self.layer_ids[elem3d]
-                idx = elem3d[layer_ids == layer]  # return at most n ids
-
-        if n == 1 and (not np.isscalar(idx)):
-            idx = idx[0]
+                idx = top - (self.n_layers - layer)
+                if np.any(idx < bot) or np.any(idx > top):
+                    raise Exception(
+                        f"Layer {layer} is not available at all points (must be between 1 and {self.n_layers}, and above the bottom)"
+                    )
         return idx
 
     def find_nearest_element(self, x, y, z=None, layer=None):
@@ -565,30 +692,271 @@ class _UnstructuredGeometry:
         -------
         np.array
             element ids of nearest element(s)
+
+        Notes
+        -----
+        The points are looked up in a spatial index (KD-tree) of the
+        element centres which is built on the first call, so many
+        points are best found in a single call.
         """
         if np.isscalar(x):
-            return self._find_n_nearest_elements(x, y, z, n=1, layer=layer)
-        else:
-            nx = len(x)
-            ny = len(y)
-            if nx != ny:
-                print(f"x and y must have same length")
+            idx = self._find_n_nearest_elements(x, y, z, n=1, layer=layer)
+            return int(idx[0])
+
+        nx = len(x)
+        ny = len(y)
+        if nx != ny:
+            print(f"x and y must have same length")
+            raise Exception
+        if z is not None:
+            nz = len(z)
+            if nx != nz:
+                print(f"z must have same length as x and y")
                 raise Exception
-            idx = np.zeros(nx, dtype=int)
-            if z is None:
-                for j in range(nx):
-                    idx[j] = self._find_n_nearest_elements(
-                        x[j], y[j], z=None, n=1, layer=layer
-                    )
+        idx = self._find_n_nearest_elements(x, y, z, n=1, layer=layer)
+        return np.asarray(idx, dtype=int)
+
+    def _get_bucket_index(self):
+        """Bucket index of the element bounding boxes (built on first use)
+        """
+        if self._bucket_index is None:
+            connectivity, offsets = self._get_connectivity()
+            xn = self.node_coordinates[connectivity, 0]
+            yn = self.node_coordinates[connectivity, 1]
+            starts = offsets[:-1]
+            self._bucket_index = BoxBuckets(
+                np.minimum.reduceat(xn, starts),
+                np.minimum.reduceat(yn, starts),
+                np.maximum.reduceat(xn, starts),
+                np.maximum.reduceat(yn, starts),
+            )
+        return self._bucket_index
+
+    def _locate_points(self, x, y):
+        """Containing element, triangle nodes and barycentric weights of points
+
+        Quads are split into the triangles (a, b, c) and (a, c, d).
+
+        Returns
+        -------
+        np.array(int)
+            element id for each point (-1 if outside the mesh)
+        np.array(int)
+            node ids of the triangle containing each point [points, 3]
+        np.array(float)
+            barycentric weights of the triangle nodes [points, 3]
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        n_points = len(x)
+        points, elems = self._get_bucket_index().candidates(x, y)
+
+        corners = self._get_element_corners()[elems]
+        xp = x[points]
+        yp = y[points]
+        xn = self.node_coordinates[:, 0]
+        yn = self.node_coordinates[:, 1]
+
+        found = np.zeros(len(points), dtype=bool)
+        tri_nodes = np.zeros((len(points), 3), dtype=np.int64)
+        tri_weights = np.zeros((len(points), 3))
+        for tri in ([0, 1, 2], [0, 2, 3]):
+            nodes = corners[:, tri]
+            xa, xb, xc = (xn[nodes[:, i]] for i in range(3))
+            ya, yb, yc = (yn[nodes[:, i]] for i in range(3))
+            det = (yb - yc) * (xa - xc) + (xc - xb) * (ya - yc)
+            ok = det != 0.0  # the second triangle of a triangle is degenerate
+            det = np.where(ok, det, 1.0)
+            wa = ((yb - yc) * (xp - xc) + (xc - xb) * (yp - yc)) / det
+            wb = ((yc - ya) * (xp - xc) + (xa - xc) * (yp - yc)) / det
+            wc = 1.0 - wa - wb
+            eps = -1e-10
+            inside = ok & (wa >= eps) & (wb >= eps) & (wc >= eps) & (~found)
+            tri_nodes[inside] = nodes[inside]
+            tri_weights[inside] = np.column_stack([wa, wb, wc])[inside]
+            found |= inside
+
+        # first containing element of each point
+        pairs = np.flatnonzero(found)
+        located, first = np.unique(points[pairs], return_index=True)
+        pairs = pairs[first]
+
+        elem_ids = np.full(n_points, -1, dtype=int)
+        elem_ids[located] = elems[pairs]
+        nodes = np.zeros((n_points, 3), dtype=np.int64)
+        nodes[located] = tri_nodes[pairs]
+        weights = np.zeros((n_points, 3))
+        weights[located] = tri_weights[pairs]
+        return elem_ids, nodes, weights
+
+    def get_elements_in_area(self, area):
+        """Find the elements with center inside an area
+
+        Parameters
+        ----------
+        area: list(float) or np.array or shapely.geometry.Polygon
+            bounding box [x0, y0, x1, y1] or polygon vertices [n, 2]
+
+        Returns
+        -------
+        np.array(int)
+            sorted element ids, for 3d files all layers of the
+            columns inside the area
+
+        Examples
+        --------
+        >>> elements = dfs.get_elements_in_area([340000, 6150000, 350000, 6160000])
+        """
+        if hasattr(area, "exterior"):
+            # shapely polygon
+            rings = [np.asarray(area.exterior.coords)[:, :2]]
+            rings += [np.asarray(ring.coords)[:, :2] for ring in area.interiors]
+        else:
+            area = np.asarray(area, dtype=np.float64)
+            if area.shape == (4,):
+                rings = []
+                x0, y0, x1, y1 = area
+            elif area.ndim == 2 and area.shape[1] == 2 and len(area) >= 3:
+                rings = [area]
             else:
-                nz = len(z)
-                if nx != nz:
-                    print(f"z must have same length as x and y")
-                for j in range(nx):
-                    idx[j] = self._find_n_nearest_elements(
-                        x[j], y[j], z[j], n=1, layer=layer
-                    )
-        return idx
+                raise ValueError(
+                    "area must be a bbox [x0, y0, x1, y1] or polygon vertices [n, 2]"
+                )
+        if len(rings) > 0:
+            (x0, y0), (x1, y1) = rings[0].min(axis=0), rings[0].max(axis=0)
+
+        # only the elements in the bounding box are tested against the polygon
+        ec = self.element_coordinates
+        candidates = np.flatnonzero(
+            (ec[:, 0] >= x0) & (ec[:, 0] <= x1) & (ec[:, 1] >= y0) & (ec[:, 1] <= y1)
+        )
+        if len(rings) > 0:
+            x = ec[candidates, 0]
+            y = ec[candidates, 1]
+            inside = points_in_polygon(x, y, rings[0])
+            for hole in rings[1:]:
+                inside &= ~points_in_polygon(x, y, hole)
+            candidates = candidates[inside]
+        return candidates
+
+    def find_containing_element(self, x, y):
+        """Find the element containing each of the points (x, y)
+
+        Parameters
+        ----------
+        x: float or list(float)
+            X coordinate(s) (easting or longitude)
+        y: float or list(float)
+            Y coordinate(s) (northing or latitude)
+
+        Returns
+        -------
+        int or np.array(int)
+            element id(s) of the containing element(s), -1 if the point
+            is outside the mesh. For 3d files the top layer element is
+            returned.
+
+        See also
+        --------
+        find_nearest_element
+        """
+        if self.is_2d:
+            elem_ids, _, _ = self._locate_points(x, y)
+        else:
+            elem_ids, _, _ = self.geometry2d._locate_points(x, y)
+            inside = elem_ids >= 0
+            elem_ids[inside] = self.top_elements[elem_ids[inside]]
+        if np.isscalar(x):
+            return int(elem_ids[0])
+        return elem_ids
+
+    def interp_weights(self, x, y):
+        """Weights for linear interpolation of node values to points (x, y)
+
+        The weights only depend on the geometry, so they can be
+        computed once and applied to every time step.
+
+        Parameters
+        ----------
+        x: float or list(float)
+            X coordinate(s) (easting or longitude)
+        y: float or list(float)
+            Y coordinate(s) (northing or latitude)
+
+        Returns
+        -------
+        np.array(int)
+            id of the element containing each point (-1 if outside)
+        scipy.sparse.csr_matrix
+            weights with dimension [points, nodes], the values at the
+            points are weights @ node_values (0 outside the mesh).
+            For 3d files the weights refer to the nodes of geometry2d.
+
+        Examples
+        --------
+        >>> elem_ids, weights = dfs.interp_weights(x, y)
+        >>> zn = dfs.node_coordinates[:, 2]
+        >>> z = weights @ zn
+        """
+        from scipy.sparse import csr_matrix
+
+        geometry = self if self.is_2d else self.geometry2d
+        elem_ids, nodes, weights = geometry._locate_points(x, y)
+        weights[elem_ids < 0] = 0.0
+        n_points = len(elem_ids)
+        rows = np.repeat(np.arange(n_points), 3)
+        weights = csr_matrix(
+            (weights.ravel(), (rows, nodes.ravel())),
+            shape=(n_points, geometry.n_nodes),
+        )
+        return elem_ids, weights
+
+    def _get_interpolant(self, x, y, method="nearest"):
+        """Interpolation from element values to the points (x, y)
+
+        The weights are computed once, the returned function can then be
+        applied to the element values of each time step.
+
+        Parameters
+        ----------
+        x: np.array(float)
+            X coordinates of the points
+        y: np.array(float)
+            Y coordinates of the points
+        method: str, optional
+            "nearest": value of the element containing the point,
+            "linear": linear interpolation of the node-centered values
+
+        Returns
+        -------
+        callable
+            f(values) with values of dimension [elements] returns the
+            values at the points, NaN outside the mesh
+        """
+        if method == "nearest":
+            elem_ids = self.find_containing_element(x, y)
+            outside = elem_ids < 0
+            elem_ids[outside] = 0
+
+            def interpolate(values):
+                d = values[elem_ids]
+                d[outside] = np.nan
+                return d
+
+        elif method == "linear":
+            elem_ids, weights = self.interp_weights(x, y)
+            outside = elem_ids < 0
+            cell_to_node, weight_sums = self._get_cell_to_node_operator()
+
+            def interpolate(values):
+                d = weights @ ((cell_to_node @ values) / weight_sums)
+                d[outside] = np.nan
+                return d
+
+        else:
+            raise ValueError(f"Unknown method '{method}', use 'nearest' or 'linear'")
+
+        return interpolate
 
     # def _find_nearest_2d_element(self, x, y):
     #     if self.is_2d:
@@ -622,72 +990,105 @@ class _UnstructuredGeometry:
             raise Exception("Object is 2d. Cannot get_nearest_profile")
         else:
             elem2d = self.geometry2d.find_nearest_element(x, y)
-            elem3d = self.e2_e3_table[elem2d]
-            return elem3d
+            offsets = self._get_column_offsets()
+            return np.arange(offsets[elem2d], offsets[elem2d + 1])
 
     def get_element_area(self):
         """Calculate the horizontal area of each element.
 
+        For 3d files the area of the 2d column is returned for
+        each element. The areas are cached on the geometry.
+
         Returns:
         np.array(float)
             areas in m2
         """
-        n_elements = self.n_elements
+        if self._element_area is None:
+            self._element_area = self._get_element_area()
+        return self._element_area
+
+    def _get_horizontal_connectivity(self):
+        """Element table of the horizontal faces in CSR format
+
+        The bottom face of 3d elements, else the elements themselves
+        """
+        connectivity, offsets = self._get_connectivity()
+        if (
+            self._type == UnstructuredType.Dfsu3DSigma
+            or self._type == UnstructuredType.Dfsu3DSigmaZ
+        ):
+            elements = np.arange(self.n_elements)
+            connectivity, offsets = _csr_take(
+                connectivity, offsets, elements, node_layers="bottom"
+            )
+        return connectivity, offsets
+
+    def _get_element_corners(self):
+        """Horizontal corners a, b, c, d of each element (d = a for triangles)
+
+        For 3d elements the corners of the bottom face are returned
+
+        Returns
+        -------
+        np.array(int32)
+            node ids with dimension [elements, 4]
+        """
+        connectivity, offsets = self._get_horizontal_connectivity()
+        corners = _csr_to_padded(connectivity, offsets)
+        if corners.shape[1] < 4:
+            pad = np.full((len(corners), 4 - corners.shape[1]), -1, dtype=np.int32)
+            corners = np.hstack([corners, pad])
+        corners = corners[:, :4]
+        for i in range(1, 4):
+            missing = corners[:, i] < 0
+            corners[missing, i] = corners[missing, 0]
+        return corners
+
+    def _get_element_area(self):
+        connectivity, offsets = self._get_connectivity()
+        nnodes_per_elem = np.diff(offsets)
 
         # Node coordinates
         xn = self.node_coordinates[:, 0]
         yn = self.node_coordinates[:, 1]
 
-        area = np.empty(n_elements)
-        xcoords = np.empty(8)
-        ycoords = np.empty(8)
-
-        for j in range(n_elements):
-            nodes = self.element_table[j]
-            n_nodes = len(nodes)
-
-            for i in range(n_nodes):
-                nidx = nodes[i]
-                xcoords[i] = xn[nidx]
-                ycoords[i] = yn[nidx]
-
-            # ab : edge vector corner a to b
-            abx = xcoords[1] - xcoords[0]
-            aby = ycoords[1] - ycoords[0]
-
-            # ac : edge vector corner a to c
-            acx = xcoords[2] - xcoords[0]
-            acy = ycoords[2] - ycoords[0]
-
-            isquad = False
-            if n_nodes > 3:
-                isquad = True
-                # ad : edge vector corner a to d
-                adx = xcoords[3] - xcoords[0]
-                ady = ycoords[3] - ycoords[0]
-
-            # if geographical coords, convert all length to meters
-            if self.is_geo:
-                earth_radius = 6366707.0
-                deg_to_rad = np.pi / 180.0
-                earth_radius_deg_to_rad = earth_radius * deg_to_rad
-
-                # Y on element centers
-                Ye = np.sum(ycoords[:n_nodes]) / n_nodes
-                cosYe = np.cos(np.deg2rad(Ye))
-
-                abx = earth_radius_deg_to_rad * abx * cosYe
-                aby = earth_radius_deg_to_rad * aby
-                acx = earth_radius_deg_to_rad * acx * cosYe
-                acy = earth_radius_deg_to_rad * acy
-                if isquad:
-                    adx = earth_radius_deg_to_rad * adx * cosYe
-                    ady = earth_radius_deg_to_rad * ady
-
-            # calculate area in m2
-            area[j] = 0.5 * (abx * acy - aby * acx)
-            if isquad:
-                area[j] = area[j] + 0.5 * (acx * ady - acy * adx)
+        # horizontal area is the area of the bottom face of 3d elements
+        corners = self._get_element_corners()
+        xcoords = xn[corners]
+        ycoords = yn[corners]
+
+        # ab : edge vector corner a to b
+        abx = xcoords[:, 1] - xcoords[:, 0]
+        aby = ycoords[:, 1] - ycoords[:, 0]
+
+        # ac : edge vector corner a to c
+        acx = xcoords[:, 2] - xcoords[:, 0]
+        acy = ycoords[:, 2] - ycoords[:, 0]
+
+        # ad : edge vector corner a to d (zero for triangles)
+        adx = xcoords[:, 3] - xcoords[:, 0]
+        ady = ycoords[:, 3] - ycoords[:, 0]
+
+        # if geographical coords, convert all length to meters
+        if self.is_geo:
+            earth_radius = 6366707.0
+            deg_to_rad = np.pi / 180.0
+            earth_radius_deg_to_rad = earth_radius * deg_to_rad
+
+            # Y on element centers
+            Ye = np.add.reduceat(yn[connectivity], offsets[:-1]) / nnodes_per_elem
+            cosYe = np.cos(np.deg2rad(Ye))
+
+            abx = earth_radius_deg_to_rad * abx * cosYe
+            aby = earth_radius_deg_to_rad * aby
+            acx = earth_radius_deg_to_rad * acx * cosYe
+            acy = earth_radius_deg_to_rad * acy
+            adx = earth_radius_deg_to_rad * adx * cosYe
+            ady = earth_radius_deg_to_rad * ady
+
+        # calculate area in m2
+        area = 0.5 * (abx * acy - aby * acx)
+        area = area + 0.5 * (acx * ady - acy * adx)
 
         return np.abs(area)
 
@@ -709,10 +1110,7 @@ class _UnstructuredGeometry:
         if self._n_layers is None:
             print("Object has no layers: cannot return e2_e3_table")
         if self._e2_e3_table is None:
-            res = self._get_2d_to_3d_association()
-            self._e2_e3_table = res[0]
-            self._2d_ids = res[1]
-            self._layer_ids = res[2]
+            self._e2_e3_table = self._get_e2_e3_table()
         return self._e2_e3_table
 
     @property
@@ -722,10 +1120,7 @@ class _UnstructuredGeometry:
         if self._n_layers is None:
             print("Object has no layers: cannot return elem2d_ids")
         if self._2d_ids is None:
-            res = self._get_2d_to_3d_association()
-            self._e2_e3_table = res[0]
-            self._2d_ids = res[1]
-            self._layer_ids = res[2]
+            self._2d_ids, self._layer_ids = self._get_2d_to_3d_association()
         return self._2d_ids
 
     @property
@@ -735,10 +1130,7 @@ class _UnstructuredGeometry:
         if self._n_layers is None:
             print("Object has no layers: cannot return layer_ids")
         if self._layer_ids is None:
-            res = self._get_2d_to_3d_association()
-            self._e2_e3_table = res[0]
-            self._2d_ids = res[1]
-            self._layer_ids = res[2]
+            self._2d_ids, self._layer_ids = self._get_2d_to_3d_association()
         return self._layer_ids
 
     @property
@@ -767,9 +1159,15 @@ class _UnstructuredGeometry:
         """
         if self._n_layers is None:
             print("Object has no layers: cannot find top_elements")
-        elif (self._top_elems is None) and (self._source is not None):
-            # note: if subset of elements is selected then this cannot be done!
-            self._top_elems = np.array(DfsuUtil.FindTopLayerElements(self._source))
+        elif self._top_elems is None:
+            if getattr(self, "_source", None) is not None:
+                # note: if subset of elements is selected then this cannot be done!
+                self._top_elems = np.array(
+                    DfsuUtil.FindTopLayerElements(self._source)
+                )
+            else:
+                # geometry created in memory
+                self._top_elems = self._get_top_elements_from_coordinates()
         return self._top_elems
 
     @property
@@ -843,32 +1241,49 @@ class _UnstructuredGeometry:
                 + layer
             )
 
+    def _get_column_offsets(self):
+        """The 3d elements of each column in compressed (CSR) format
+
+        The 3d elements of a column are numbered consecutively from the
+        bottom to the top, so the elements of column j (the 2d element j)
+        are offsets[j], ..., offsets[j+1]-1
+
+        Returns
+        -------
+        np.array(int64)
+            start of each column (n_columns + 1 values)
+        """
+        if self._column_offsets is None:
+            top_elems = self.top_elements
+            offsets = np.zeros(len(top_elems) + 1, dtype=np.int64)
+            offsets[1:] = top_elems + 1
+            self._column_offsets = offsets
+        return self._column_offsets
+
     def _get_2d_to_3d_association(self):
-        e2_to_e3 = (
-            []
-        )  # for each 2d element: the corresponding 3d element ids from bot to top
-        index2d = []  # for each 3d element: the associated 2d element id
-        layerid = []  # for each 3d element: the associated layer number
-        n2d = len(self.top_elements)
-        topid = self.top_elements
-        botid = self.bottom_elements
-        global_layer_ids = np.arange(1, self.n_layers + 1)  # layer_ids = 1, 2, 3...
-        for j in range(n2d):
-            col = np.array(list(range(botid[j], topid[j] + 1)))
-
-            e2_to_e3.append(col)
-            for jj in col:
-                index2d.append(j)
-
-            n_local_layers = len(col)
-            local_layers = global_layer_ids[-n_local_layers:]
-            for ll in local_layers:
-                layerid.append(ll)
-
-        e2_to_e3 = np.array(e2_to_e3)
-        index2d = np.array(index2d)
-        layerid = np.array(layerid)
-        return e2_to_e3, index2d, layerid
+        offsets = self._get_column_offsets()
+        n_layers_column = np.diff(offsets)
+        n2d = len(n_layers_column)
+        # for each 3d element: the associated 2d element id
+        index2d = np.repeat(np.arange(n2d), n_layers_column)
+        # for each 3d element: the associated layer number (the top
+        # element of each column is in layer n_layers)
+        elem3d = np.arange(offsets[-1])
+        layerid = self.n_layers - (offsets[1:][index2d] - 1 - elem3d)
+        return index2d, layerid
+
+    def _get_e2_e3_table(self):
+        # for each 2d element: the corresponding 3d element ids from bot to top
+        offsets = self._get_column_offsets()
+        n_layers_column = np.diff(offsets)
+        n2d = len(n_layers_column)
+        elem3d = np.arange(offsets[-1])
+        if np.all(n_layers_column == n_layers_column[0]):
+            return elem3d.reshape(n2d, -1)
+        e2_to_e3 = np.empty(n2d, dtype=object)
+        for j, col in enumerate(np.split(elem3d, offsets[1:-1])):
+            e2_to_e3[j] = col
+        return e2_to_e3
 
     def _to_polygons(self, geometry=None):
         """generate matplotlib polygons from element table for plotting
@@ -882,41 +1297,166 @@ class _UnstructuredGeometry:
             geometry = self
         from matplotlib.patches import Polygon
 
-        polygons = []
+        connectivity, offsets = geometry._get_connectivity()
+        xy = geometry.node_coordinates[connectivity, 0:2]
+        polygons = [
+            Polygon(pcoords, closed=True) for pcoords in np.split(xy, offsets[1:-1])
+        ]
+        return polygons
+
+    def _get_polygon_vertices(self):
+        """Corner coordinates of all elements [elements, 4, 2] (cached)
 
-        for j in range(geometry.n_elements):
-            nodes = geometry.element_table[j]
-            pcoords = np.empty([len(nodes), 2])
-            for i in range(len(nodes)):
-                nidx = nodes[i]
-                pcoords[i, :] = geometry.node_coordinates[nidx, 0:2]
+        Triangles repeat their first corner, so all elements can be drawn
+        from one array (e.g. by a matplotlib PolyCollection)
+        """
+        if self._polygon_vertices is None:
+            corners = self._get_element_corners()
+            self._polygon_vertices = self.node_coordinates[corners, 0:2]
+        return self._polygon_vertices
 
-            polygon = Polygon(pcoords, True)
-            polygons.append(polygon)
-        return polygons
+    def _decimate_elements(self, ax, verts):
+        """Elements to draw when many elements are smaller than a pixel
 
-    def to_shapely(self):
+        Elements smaller than a screen pixel of ax are thinned so that
+        at most one of them is drawn in each pixel.
+        """
+        bbox = ax.get_window_extent()
+        xmin, ymin = verts.min(axis=(0, 1))
+        xmax, ymax = verts.max(axis=(0, 1))
+        px = max((xmax - xmin) / max(bbox.width, 1), 1e-12)
+        py = max((ymax - ymin) / max(bbox.height, 1), 1e-12)
+
+        extent = np.maximum(
+            np.ptp(verts[:, :, 0], axis=1) / px, np.ptp(verts[:, :, 1], axis=1) / py
+        )
+        small = np.flatnonzero(extent < 1.0)
+        if len(small) == 0:
+            return np.arange(len(verts))
+
+        center = verts[small].mean(axis=1)
+        i = ((center[:, 0] - xmin) / px).astype(np.int64)
+        j = ((center[:, 1] - ymin) / py).astype(np.int64)
+        pixel = j * (int(bbox.width) + 2) + i
+        _, first = np.unique(pixel, return_index=True)
+        keep = np.ones(len(verts), dtype=bool)
+        keep[small] = False
+        keep[small[first]] = True
+        return np.flatnonzero(keep)
+
+    def to_shapely(self, dissolve=False):
         """Export mesh as shapely MultiPolygon
 
+        Parameters
+        ----------
+        dissolve : bool, optional
+            return the outline of the mesh (the union of all elements)
+            instead of the elements, default: False
+
         Returns
         -------
         shapely.geometry.MultiPolygon
-            polygons with mesh elements
+            polygons with mesh elements (or the outline if dissolve=True)
         """
         from shapely.geometry import Polygon, MultiPolygon
 
-        polygons = []
-        for j in range(self.n_elements):
-            nodes = self.element_table[j]
-            pcoords = np.empty([len(nodes), 2])
-            for i in range(len(nodes)):
-                nidx = nodes[i]
-                pcoords[i, :] = self.node_coordinates[nidx, 0:2]
-            polygon = Polygon(pcoords)
-            polygons.append(polygon)
-        mp = MultiPolygon(polygons)
+        connectivity, offsets = self._get_horizontal_connectivity()
+        xy = self.node_coordinates[connectivity, 0:2]
+        try:
+            # shapely 2: all polygons in one call
+            import shapely
+            from shapely import linearrings, polygons, multipolygons
+        except ImportError:
+            polygons = [Polygon(pcoords) for pcoords in np.split(xy, offsets[1:-1])]
+            if dissolve:
+                from shapely.ops import unary_union
+
+                return unary_union(polygons)
+            return MultiPolygon(polygons)
+
+        indices = np.repeat(np.arange(self.n_elements), np.diff(offsets))
+        elements = polygons(linearrings(xy, indices=indices))
+        if dissolve:
+            union = getattr(shapely, "coverage_union_all", shapely.union_all)
+            return union(elements)
+        return multipolygons(elements)
+
+    def iter_features(self, data=None, chunk_size=10000):
+        """Iterate over the elements as GeoJSON-like features
+
+        Parameters
+        ----------
+        data : dict, optional
+            name -> array with a value for each element,
+            added to the properties of the features
+        chunk_size : int, optional
+            number of elements converted at a time, default 10000
+
+        Yields
+        ------
+        dict
+            {"type": "Feature", "geometry": {"type": "Polygon", ...},
+            "properties": {"id": element id, ...}}
+
+        Notes
+        -----
+        Only one chunk of elements is converted to Python objects at a
+        time, so the features of large meshes can be streamed to a file,
+        e.g. with to_geojson or fiona's writerecords.
+        """
+        connectivity, offsets = self._get_horizontal_connectivity()
+        xy = self.node_coordinates[:, 0:2]
+        if data is None:
+            data = {}
+
+        for start in range(0, self.n_elements, chunk_size):
+            stop = min(start + chunk_size, self.n_elements)
+            local = offsets[start : stop + 1] - offsets[start]
+            chunk_xy = xy[connectivity[offsets[start] : offsets[stop]]].tolist()
+            values = {}
+            for name, value in data.items():
+                value = np.asarray(value)[start:stop]
+                if value.dtype.kind == "f":
+                    value = np.where(np.isnan(value), None, value)
+                values[name] = value.tolist()
+
+            for j in range(stop - start):
+                ring = chunk_xy[local[j] : local[j + 1]]
+                ring.append(ring[0])
+                properties = {"id": start + j}
+                for name, value in values.items():
+                    properties[name] = value[j]
+                yield {
+                    "type": "Feature",
+                    "geometry": {"type": "Polygon", "coordinates": [ring]},
+                    "properties": properties,
+                }
+
+    def to_geojson(self, filename, data=None, chunk_size=10000):
+        """Write the mesh elements as polygons to a GeoJSON file
 
-        return mp
+        Parameters
+        ----------
+        filename : str
+            path to the new GeoJSON file
+        data : dict, optional
+            name -> array with a value for each element,
+            written as properties of the polygons
+        chunk_size : int, optional
+            number of elements converted at a time, default 10000
+
+        Examples
+        --------
+        >>> ds = dfs.read(time_steps=0)
+        >>> dfs.to_geojson("mesh.geojson", {"depth": dfs.element_coordinates[:, 2]})
+        """
+        with open(filename, "w") as f:
+            f.write('{"type": "FeatureCollection", "features": [\n')
+            for i, feature in enumerate(self.iter_features(data, chunk_size)):
+                if i > 0:
+                    f.write(",\n")
+                f.write(json.dumps(feature))
+            f.write("\n]}\n")
 
     def get_node_centered_data(self, data, extrapolate=True):
         """convert cell-centered data to node-centered by pseudo-laplacian method
@@ -924,45 +1464,226 @@ class _UnstructuredGeometry:
         Parameters
         ----------
         data : np.array(float)
-            cell-centered data 
+            cell-centered data, either a single vector [elements]
+            or a block of time steps [t, elements]
         extrapolate : bool, optional
             allow the method to extrapolate, default:True
 
         Returns
         -------
         np.array(float)
-            node-centered data 
+            node-centered data with dimension [nodes] or [t, nodes]
+
+        Notes
+        -----
+        The interpolation weights only depend on the geometry. They are
+        computed once (for each value of extrapolate) and cached as a
+        sparse matrix, so all time steps are converted in one product.
         """
-        nc = self.node_coordinates
-        elem_table, ec = self._create_tri_only_element_table()
-        
-        node_cellID = [list(np.argwhere(elem_table == i)[:, 0]) for i in np.unique(elem_table.reshape(-1, ))]
-        node_centered_data = np.zeros(shape=nc.shape[0])
-        for n, item in enumerate(node_cellID):
-            I = ec[item][:, :2] - nc[n][:2]
-            I2 = (I ** 2).sum(axis=0)
-            Ixy = (I[:, 0] * I[:, 1]).sum(axis=0)
-            lamb = I2[0] * I2[1] - Ixy ** 2
-            omega=np.zeros(1)
-            if lamb > 1e-10 * (I2[0] * I2[1]):
-                # Standard case - Pseudo
-                lambda_x = (Ixy * I[:, 1] - I2[1] * I[:, 0]) / lamb
-                lambda_y = (Ixy * I[:, 0] - I2[0] * I[:, 1]) / lamb
-                omega = 1.0 + lambda_x * I[:, 0] + lambda_y * I[:, 1]
-                if not extrapolate:
-                    omega[np.where(omega > 2)] = 2
-                    omega[np.where(omega < 0)] = 0
-            if omega.sum()>0:
-                node_centered_data[n] = np.sum(omega * data[item]) / np.sum(omega)
-            else:
-                # We did not succeed using pseudo laplace procedure, use inverse distance instead
-                InvDis = [1 / np.hypot(case[0], case[1]) for case in ec[item][:, :2] - nc[n][:2]]
-                node_centered_data[n] = np.sum(InvDis * data[item]) / np.sum(InvDis)
+        weights, weight_sums = self._get_cell_to_node_operator(extrapolate)
+        data = np.asarray(data)
+        if data.ndim == 1:
+            return weights @ data / weight_sums
+        return (weights @ data.T).T / weight_sums
+
+    def get_node_elements(self):
+        """The elements of each node in compressed (CSR) format
+
+        The elements of node i are elements[offsets[i]:offsets[i+1]],
+        sorted by element id.
+
+        Returns
+        -------
+        np.array(int64)
+            element ids of all nodes, one node after the other
+        np.array(int64)
+            start of each node in the element ids (n_nodes + 1 values)
+
+        Examples
+        --------
+        >>> elements, offsets = dfs.get_node_elements()
+        >>> elements[offsets[node]:offsets[node + 1]]
+        """
+        if self._node_elements is None:
+            connectivity, offsets = self._get_connectivity()
+            elem = np.repeat(np.arange(self.n_elements), np.diff(offsets))
+            order = np.argsort(connectivity, kind="stable")
+            node_offsets = np.zeros(self.n_nodes + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(connectivity, minlength=self.n_nodes),
+                out=node_offsets[1:],
+            )
+            self._node_elements = elem[order], node_offsets
+        return self._node_elements
+
+    def _get_faces(self):
+        """Faces (edges) of the 2d mesh (cached)
+
+        The faces are found by sorting the (min node, max node) keys of all
+        element edges, so the edges shared by two elements become adjacent.
+
+        Returns
+        -------
+        np.array(int32)
+            node ids of each face [faces, 2], ordered counter-clockwise
+            around the first element of the face
+        np.array(int64)
+            elements on each side of the face [faces, 2], the second
+            element is -1 for boundary faces
+        np.array(int64)
+            face id of each edge of the elements, the edge from node
+            connectivity[i] to the next node of the element is face i
+        """
+        if not self.is_2d:
+            raise Exception(
+                "Faces are only available for 2d geometries, use geometry2d"
+            )
+        if self._faces is None:
+            connectivity, offsets = self._get_connectivity()
+            n = len(connectivity)
+            elem = np.repeat(np.arange(self.n_elements), np.diff(offsets))
+
+            # edge from each node to the next node of the element
+            nxt = np.arange(1, n + 1)
+            nxt[offsets[1:] - 1] = offsets[:-1]
+            a = connectivity.astype(np.int64)
+            b = a[nxt]
+            key = np.minimum(a, b) * self.n_nodes + np.maximum(a, b)
+
+            order = np.argsort(key, kind="stable")
+            sorted_key = key[order]
+            is_first = np.ones(n, dtype=bool)
+            is_first[1:] = sorted_key[1:] != sorted_key[:-1]
+            edge_faces = np.empty(n, dtype=np.int64)
+            edge_faces[order] = np.cumsum(is_first) - 1
+
+            first = order[is_first]
+            second = order[~is_first]
+            face_nodes = np.column_stack([a[first], b[first]]).astype(np.int32)
+            face_elements = np.full((len(first), 2), -1, dtype=np.int64)
+            face_elements[:, 0] = elem[first]
+            face_elements[edge_faces[second], 1] = elem[second]
+            self._faces = face_nodes, face_elements, edge_faces
+        return self._faces
+
+    def get_element_neighbours(self):
+        """The neighbouring elements across each face of the elements
+
+        Returns
+        -------
+        np.array(int64)
+            neighbour ids with dimension [elements, max_nodes_per_element],
+            the neighbour across the face from node j to node j+1 of the
+            element is in column j. -1 on the boundary and for the
+            missing faces of triangles in a mixed mesh.
+
+        Examples
+        --------
+        >>> nb = dfs.get_element_neighbours()
+        >>> nb[0][nb[0] >= 0]
+        array([  1, 121])
+        """
+        face_nodes, face_elements, edge_faces = self._get_faces()
+        connectivity, offsets = self._get_connectivity()
+        elem = np.repeat(np.arange(self.n_elements), np.diff(offsets))
+        col = np.arange(len(connectivity)) - offsets[elem]
+
+        first, second = face_elements[edge_faces].T
+        other = np.where(first == elem, second, first)
+        neighbours = np.full(
+            (self.n_elements, self.max_nodes_per_element), -1, dtype=np.int64
+        )
+        neighbours[elem, col] = other
+        return neighbours
+
+    def get_boundary_edges(self):
+        """The faces on the boundary of the mesh and their codes
+
+        The code of an edge is the highest code of its two nodes, e.g. an
+        edge from a land node (code 1) to an open boundary node (code 2)
+        belongs to the open boundary.
+
+        Returns
+        -------
+        np.array(int32)
+            node ids of each boundary edge [edges, 2], ordered
+            counter-clockwise around the mesh (clockwise around islands)
+        np.array(int)
+            code of each boundary edge
+
+        Examples
+        --------
+        >>> edges, codes = msh.get_boundary_edges()
+        >>> xy = msh.node_coordinates[edges[codes == 2], :2]
+        """
+        face_nodes, face_elements, _ = self._get_faces()
+        edges = face_nodes[face_elements[:, 1] < 0]
+        codes = np.asarray(self.codes)
+        return edges, np.maximum(codes[edges[:, 0]], codes[edges[:, 1]])
+
+    def _get_cell_to_node_operator(self, extrapolate=True):
+        """Sparse pseudo-laplacian weights from elements to nodes (cached)
 
-        return node_centered_data
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            weights with dimension [nodes, elements]
+        np.array(float)
+            sum of the weights of each node
+        """
+        if self._cell_to_node is None:
+            self._cell_to_node = {}
+        if extrapolate not in self._cell_to_node:
+            self._cell_to_node[extrapolate] = self._create_cell_to_node_operator(
+                extrapolate
+            )
+        return self._cell_to_node[extrapolate]
 
+    def _create_cell_to_node_operator(self, extrapolate):
+        from scipy.sparse import csr_matrix
 
-    def plot(self, z=None, elements=None, label=None, cmap=None, vmin=None, vmax=None, plot_type='patch', n_levels=10, n_refinements=0, plot_mesh=True):
+        nc = self.node_coordinates
+        ec = self.element_coordinates
+        n_nodes = self.n_nodes
+
+        # (node, element) pairs sorted by node
+        elem, node_offsets = self.get_node_elements()
+        node = np.repeat(np.arange(n_nodes), np.diff(node_offsets))
+
+        def node_sum(values):
+            return np.bincount(node, weights=values, minlength=n_nodes)
+
+        dx = ec[elem, 0] - nc[node, 0]
+        dy = ec[elem, 1] - nc[node, 1]
+        Ixx = node_sum(dx ** 2)[node]
+        Iyy = node_sum(dy ** 2)[node]
+        Ixy = node_sum(dx * dy)[node]
+        lamb = Ixx * Iyy - Ixy ** 2
+
+        # Standard case - Pseudo
+        standard = lamb > 1e-10 * (Ixx * Iyy)
+        lamb = np.where(standard, lamb, 1.0)
+        lambda_x = (Ixy * dy - Iyy * dx) / lamb
+        lambda_y = (Ixy * dx - Ixx * dy) / lamb
+        omega = np.where(standard, 1.0 + lambda_x * dx + lambda_y * dy, 0.0)
+        if not extrapolate:
+            omega = np.clip(omega, 0, 2)
+
+        # We did not succeed using pseudo laplace procedure, use inverse distance instead
+        # The sum of omega is zero in exact arithmetic for e.g. nodes with two
+        # elements, so compare it to the size of the terms instead of to 0
+        scale = node_sum(1.0 + np.abs(lambda_x * dx) + np.abs(lambda_y * dy))
+        pseudo = (node_sum(omega) > 1e-8 * scale)[node]
+        with np.errstate(divide="ignore"):
+            weights = np.where(pseudo, omega, 1 / np.hypot(dx, dy))
+
+        weight_sums = node_sum(weights)
+        weight_sums[weight_sums == 0] = np.nan  # node without elements
+
+        op = csr_matrix((weights, (node, elem)), shape=(n_nodes, self.n_elements))
+        return op, weight_sums
+
+    def plot(self, z=None, elements=None, label=None, cmap=None, vmin=None, vmax=None, plot_type='patch', n_levels=10, n_refinements=0, plot_mesh=True, ax=None, decimate=False):
         """
         Plot mesh elements
 
@@ -989,7 +1710,23 @@ class _UnstructuredGeometry:
         n_refinements: int
             for 'shaded' and 'contour' plots (and if plot_mesh=False) 
             do this number of mesh refinements for smoother plotting         
+        ax: matplotlib.axes.Axes, optional
+            axes to plot in, default a new figure. A 'patch' plot of
+            all elements in the same axes and with the same cmap, label,
+            plot_mesh and decimate as the previous 'patch' plot only
+            updates the values (fast for animations)
+        decimate: bool, optional
+            for 'patch' plots: draw at most one of the elements that are
+            smaller than a screen pixel in each pixel, default:False
+
+        Returns
+        -------
+        matplotlib.axes.Axes
         """
+        import matplotlib.cm as cm
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+
         if cmap is None:
             cmap = cm.viridis
 
@@ -1027,8 +1764,24 @@ class _UnstructuredGeometry:
         if vmax is None:
             vmax = z.max()
 
+        if plot_type == 'patch' and elements is None and ax is not None:
+            # new values in the same axes and style: only update the collection
+            if geometry._plot_collection is not None:
+                p_ref, p_style, p_decimated = geometry._plot_collection
+                p = p_ref()
+                style = (cmap, label, plot_mesh, decimate)
+                if p is not None and p.axes is ax and p_style == style:
+                    if p_decimated is not None:
+                        z = z[p_decimated]
+                    p.set_array(z)
+                    p.set_clim(vmin, vmax)
+                    return ax
+
         # set aspect ratio
-        fig, ax = plt.subplots()
+        if ax is None:
+            fig, ax = plt.subplots()
+        else:
+            fig = ax.get_figure()
         if geometry.is_geo:
             mean_lat = 0.5*(max(nc[:,1])-min(nc[:,1]))
             ax.set_aspect(1./np.cos(np.pi*mean_lat/180))            
@@ -1038,21 +1791,33 @@ class _UnstructuredGeometry:
         if plot_type == 'patch':
             # do plot as patches (like MZ "box contour")
             # with (constant) element center values
-            patches = geometry._to_polygons()
+            verts = geometry._get_polygon_vertices()
+            keep = None
+            if decimate:
+                keep = geometry._decimate_elements(ax, verts)
+                verts = verts[keep]
+                z = z[keep]
 
             if plot_mesh:
-                p = PatchCollection(
-                    patches, cmap=cmap, edgecolor="face", linewidths=0.0
+                p = PolyCollection(
+                    verts, cmap=cmap, edgecolor="face", linewidths=0.0
                 ) 
             else:
-                p = PatchCollection(
-                    patches, cmap=cmap, edgecolor="face", alpha=None, linewidths=None
+                p = PolyCollection(
+                    verts, cmap=cmap, edgecolor="face", alpha=None, linewidths=None
                 )
 
             p.set_array(z)
             p.set_clim(vmin, vmax)
             ax.add_collection(p)
             fig.colorbar(p, ax=ax, label=label)
+            if elements is None:
+                # weak reference, the geometry should not keep the figure alive
+                geometry._plot_collection = (
+                    weakref.ref(p),
+                    (cmap, label, plot_mesh, decimate),
+                    keep,
+                )
         else: 
             # do node-based triangular plot
             import matplotlib.tri as tri
@@ -1088,31 +1853,46 @@ class _UnstructuredGeometry:
                 #             colors=['0.5'],
                 #             linewidths=[0.5])
             
-            plt.colorbar(tr_fig, label=label)
+            fig.colorbar(tr_fig, ax=ax, label=label)
 
         ax.set_xlim(nc[:, 0].min(), nc[:, 0].max())
         ax.set_ylim(nc[:, 1].min(), nc[:, 1].max())
+        return ax
 
     def _create_tri_only_element_table(self, geometry=None):
         """Convert quad/tri mesh to pure tri-mesh
+
+        Each quad (a, b, c, d) is replaced by the triangle (a, b, c) and
+        the triangle (c, d, a) is appended after all elements. The
+        triangulation is cached on the geometry.
+
+        Returns
+        -------
+        np.array(int)
+            element table of the triangles [triangles, 3]
+        np.array(float)
+            element coordinates of the element each triangle comes from
         """
         if geometry is None:
             geometry = self
-        
-        ec = geometry.element_coordinates
-        if geometry.is_tri_only:
-            return np.asarray(geometry.element_table), ec 
-        
-        elem_table = [list(geometry.element_table[i]) for i in range(geometry.n_elements)]
-        tmp_elmnt_nodes = elem_table.copy()
-        for el, item in enumerate(tmp_elmnt_nodes):
-            if len(item)==4:
-                elem_table.pop(el)
-                elem_table.insert(el,item[:3])
-                elem_table.append([item[i] for i in [2,3,0]])
-                ec = np.append(ec, ec[el].reshape(1, -1), axis=0)
 
-        return np.asarray(elem_table), ec
+        if geometry._tri_only is None:
+            connectivity, offsets = geometry._get_connectivity()
+            elem_table = _csr_to_padded(connectivity, offsets)
+            elements = np.arange(geometry.n_elements)
+            if not geometry.is_tri_only:
+                quads = np.flatnonzero(np.diff(offsets) == 4)
+                elem_table = np.vstack(
+                    [elem_table[:, :3], elem_table[quads][:, [2, 3, 0]]]
+                )
+                elements = np.concatenate([elements, quads])
+            geometry._tri_only = (elem_table, elements)
+
+        elem_table, elements = geometry._tri_only
+        ec = geometry.element_coordinates
+        if len(elements) > len(ec):
+            ec = ec[elements]
+        return elem_table, ec
 
 
 class _UnstructuredFile(_UnstructuredGeometry):
@@ -1123,6 +1903,7 @@ class _UnstructuredFile(_UnstructuredGeometry):
 
     _filename = None
     _source = None
+    _backend = "dotnet"
     _deletevalue = None
 
     _n_timesteps = None
@@ -1177,7 +1958,10 @@ class _UnstructuredFile(_UnstructuredGeometry):
             self._read_mesh_header(filename)
 
         elif ext == ".dfsu":
-            self._read_dfsu_header(filename)
+            if self._backend == "numpy":
+                self._read_dfsu_header_raw(filename)
+            else:
+                self._read_dfsu_header(filename)
         else:
             raise Exception(f"Filetype {ext} not supported (mesh,dfsu)")
 
@@ -1223,33 +2007,296 @@ class _UnstructuredFile(_UnstructuredGeometry):
 
         dfs.Close()
 
+    def _read_dfsu_header_raw(self, filename):
+        """
+        Read header of dfsu file with numpy and set object properties
+        """
+        raw = RawDfsFile(filename)
+        self._source = raw
+        self._projstr = raw.projection[0]
+        self._deletevalue = raw.deletevalue
+
+        n_nodes, n_elements, dim, n_layers, n_sigma = raw.custom_blocks["MIKE_FM"]
+        if dim == 1:
+            self._type = UnstructuredType.DfsuVerticalColumn
+        elif dim == 2 and n_layers == 0:
+            self._type = UnstructuredType.Dfsu2D
+        elif dim == 2:
+            if n_layers == n_sigma:
+                self._type = UnstructuredType.DfsuVerticalProfileSigma
+            else:
+                self._type = UnstructuredType.DfsuVerticalProfileSigmaZ
+        elif n_layers == n_sigma:
+            self._type = UnstructuredType.Dfsu3DSigma
+        else:
+            self._type = UnstructuredType.Dfsu3DSigmaZ
+
+        # geometry
+        static = raw.static_items
+        self._nc = np.column_stack(
+            [static["X-coord"], static["Y-coord"], static["Z-coord"]]
+        ).astype(np.float64)
+        self._codes = np.array(static["Code"])
+        self._n_nodes = int(n_nodes)
+        self._node_ids = static["Node id"] - 1
+
+        self._n_elements = int(n_elements)
+        offsets = np.zeros(self._n_elements + 1, dtype=np.int64)
+        np.cumsum(static["No of nodes"], out=offsets[1:])
+        self._offsets = offsets
+        self._connectivity = static["Connectivity"] - 1  # make 0-based
+        self._element_ids = static["Element id"] - 1
+
+        if not self.is_2d:
+            self._n_layers = int(n_layers)
+            self._n_sigma = int(n_sigma)
+            self._top_elems = self._find_top_layer_elements()
+
+        # items
+        self._n_items = raw.n_items
+        self._items = raw.get_item_info(list(range(self._n_items)))
+
+        # time
+        self._start_time = raw.start_time
+        self._n_timesteps = raw.n_timesteps
+        self._timestep_in_seconds = raw.timestep
+
+        raw.close()
+
     def _set_nodes_from_source(self, source):
         xn = asNumpyArray(source.X)
         yn = asNumpyArray(source.Y)
         zn = asNumpyArray(source.Z)
         self._nc = np.column_stack([xn, yn, zn])
-        self._codes = np.array(list(source.Code))
+        self._codes = asNumpyArray(source.Code)
         self._n_nodes = source.NumberOfNodes
-        self._node_ids = np.array(list(source.NodeIds)) - 1
+        self._node_ids = asNumpyArray(source.NodeIds) - 1
 
     def _set_elements_from_source(self, source):
         self._n_elements = source.NumberOfElements
         self._element_table_dotnet = source.ElementTable
         self._element_table = None  # do later if needed
-        self._element_ids = np.array(list(source.ElementIds)) - 1
+        self._connectivity = None
+        self._offsets = None
+        self._element_ids = asNumpyArray(source.ElementIds) - 1
+
+
+class _LazyTimeSteps:
+    """Array-like of dimension [t, ...] computing a time step when indexed
+
+    Only data[i] and data[i, ...] are supported, e.g. for writing the
+    time steps one at a time without holding all of them in memory.
+    """
+
+    def __init__(self, get_timestep, shape):
+        self._get_timestep = get_timestep
+        self.shape = shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            step, key = key[0], key[1:]
+            return np.array(self._get_timestep(step))[key]
+        return np.array(self._get_timestep(key))
+
+
+# format of the start time in the cache header
+_cache_time_format = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _get_cache_path(filename, cache_dir):
+    """Cache sub directory of a file, keyed by file size, mtime and header hash"""
+    stat = os.stat(filename)
+    with open(filename, "rb") as f:
+        header_hash = hashlib.sha1(f.read(65536)).hexdigest()
+    key = f"{os.path.abspath(filename)}|{stat.st_size}|{stat.st_mtime_ns}|{header_hash}"
+    key = hashlib.sha1(key.encode()).hexdigest()[:16]
+    name = os.path.basename(filename)
+    return os.path.join(cache_dir, f"{name}-{key}")
 
 
 class Dfsu(_UnstructuredFile):
-    def __init__(self, filename):
+
+    # geometry arrays stored in the cache
+    _cache_arrays = (
+        "_nc",
+        "_codes",
+        "_node_ids",
+        "_element_ids",
+        "_connectivity",
+        "_offsets",
+        "_ec",
+        "_top_elems",
+        "_element_area",
+    )
+
+    def __init__(self, filename, backend="dotnet", cache_dir=None):
+        """Create a Dfsu object for reading
+
+        Parameters
+        ----------
+        filename: str
+            File name including full path to the dfsu file.
+        backend: str, optional
+            "dotnet" (default) reads with the DHI .NET libraries,
+            "numpy" reads the file directly with numpy
+        cache_dir: str, optional
+            directory with a cache of the header and geometry of dfsu
+            files. The first time a file is opened the geometry (including
+            element coordinates, top elements and areas) is stored in
+            the cache, later the arrays are memory mapped (copy-on-write)
+            from the cache without opening the file. The cache of a file is invalid if
+            its size, modification time or header changes.
+            Default: no cache
+        """
         super().__init__()
         self._filename = filename
-        self._read_header(filename)
+        self._backend = validate_backend(backend)
+        if cache_dir is None:
+            self._read_header(filename)
+        elif not self._load_cache(cache_dir):
+            self._read_header(filename)
+            self._save_cache(cache_dir)
+
+    def _get_connectivity_from_dotnet(self):
+        # the element table is also stored as the static items "No of nodes"
+        # and "Connectivity", which are transferred with one memmove each
+        # instead of copying the elements of the jagged .NET table one by one
+        if not self._filename.lower().endswith(".dfsu"):
+            return super()._get_connectivity_from_dotnet()
+
+        static = {}
+        dfs = DfsFileFactory.DfsGenericOpen(self._filename)
+        try:
+            item = dfs.ReadStaticItemNext()
+            while item is not None:
+                if item.Name in ("No of nodes", "Connectivity"):
+                    static[item.Name] = asNumpyArray(item.Data)
+                item = dfs.ReadStaticItemNext()
+        finally:
+            dfs.Close()
+        if len(static) < 2 or len(static["No of nodes"]) != self.n_elements:
+            return super()._get_connectivity_from_dotnet()
+
+        offsets = np.zeros(self.n_elements + 1, dtype=np.int64)
+        np.cumsum(static["No of nodes"], out=offsets[1:])
+        connectivity = static["Connectivity"].astype(np.int32) - 1  # make 0-based
+        return connectivity, offsets
+
+    def _load_cache(self, cache_dir):
+        """Set header and geometry from the cache, returns False if not cached"""
+        if not os.path.isfile(self._filename):
+            return False
+        path = _get_cache_path(self._filename, cache_dir)
+        try:
+            with open(os.path.join(path, "header.json")) as f:
+                header = json.load(f)
+            arrays = {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
+                for name in header["arrays"]
+            }
+        except (OSError, ValueError, KeyError):
+            return False
+
+        for name, value in arrays.items():
+            setattr(self, name, value)
+        self._type = UnstructuredType(header["type"])
+        self._projstr = header["projection"]
+        self._deletevalue = header["deletevalue"]
+        self._n_nodes = header["n_nodes"]
+        self._n_elements = header["n_elements"]
+        self._n_layers = header["n_layers"]
+        self._n_sigma = header["n_sigma"]
+        if header["items"] is not None:
+            self._items = [
+                ItemInfo(name, EUMType(itemtype), EUMUnit(unit))
+                for name, itemtype, unit in header["items"]
+            ]
+            self._n_items = len(self._items)
+        if header["start_time"] is not None:
+            self._start_time = datetime.strptime(
+                header["start_time"], _cache_time_format
+            )
+        self._n_timesteps = header["n_timesteps"]
+        self._timestep_in_seconds = header["timestep"]
+        return True
+
+    def _get_source(self):
+        """File with the item information, opened again after a cache hit"""
+        if self._source is None:
+            if self._backend == "numpy":
+                source = RawDfsFile(self._filename)
+                source.close()
+            else:
+                source = DfsuFile.Open(self._filename)
+                source.Close()
+            self._source = source
+        return self._source
+
+    def _save_cache(self, cache_dir):
+        """Store header and geometry (incl. derived arrays) in the cache"""
+        # compute the derived geometry
+        self._get_connectivity()
+        _ = self.element_coordinates
+        self.get_element_area()
+        if not self.is_2d:
+            _ = self.top_elements
+
+        header = dict(
+            type=int(self._type),
+            projection=self._projstr,
+            deletevalue=self._deletevalue,
+            n_nodes=int(self._n_nodes),
+            n_elements=int(self._n_elements),
+            n_layers=None if self._n_layers is None else int(self._n_layers),
+            n_sigma=None if self._n_sigma is None else int(self._n_sigma),
+            items=None,
+            start_time=None,
+            n_timesteps=None,
+            timestep=self._timestep_in_seconds,
+            arrays=[],
+        )
+        # a mesh file has no items and no time axis
+        if self._items is not None:
+            header["items"] = [
+                [item.name, int(item.type), int(item.unit)] for item in self._items
+            ]
+        if self._start_time is not None:
+            header["start_time"] = self._start_time.strftime(_cache_time_format)
+        if self._n_timesteps is not None:
+            header["n_timesteps"] = int(self._n_timesteps)
+
+        path = _get_cache_path(self._filename, cache_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # write to a temporary directory first, so a cache is never
+            # read while it is being written
+            tmp_path = tempfile.mkdtemp(dir=cache_dir)
+            for name in self._cache_arrays:
+                value = getattr(self, name)
+                if value is not None:
+                    np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(value))
+                    header["arrays"].append(name)
+            with open(os.path.join(tmp_path, "header.json"), "w") as f:
+                json.dump(header, f)
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                # another process has written the cache in the meantime
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        except OSError as e:
+            warnings.warn(f"Could not write dfsu cache to {cache_dir}: {e}")
 
     @property
     def element_coordinates(self):
         # faster way of getting element coordinates than base class implementation
         if self._ec is None:
-            self._ec = self._get_element_coords_from_source()
+            if self._backend == "numpy":
+                self._ec = self._get_element_coords()
+            else:
+                self._ec = self._get_element_coords_from_source()
         return self._ec
 
     def _get_element_coords_from_source(self):
@@ -1313,7 +2360,16 @@ class Dfsu(_UnstructuredFile):
             seconds=((self.n_timesteps - 1) * self.timestep)
         )
 
-    def read(self, items=None, time_steps=None, elements=None):
+    def read(
+        self,
+        items=None,
+        time_steps=None,
+        elements=None,
+        dtype=np.float64,
+        out=None,
+        scratch_dir=None,
+        area=None,
+    ):
         """
         Read data from a dfsu file
 
@@ -1327,12 +2383,47 @@ class Dfsu(_UnstructuredFile):
             Read only selected time_steps
         elements: list[int], optional
             Read only selected element ids   
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64.
+            The file stores single precision values, so np.float32
+            halves the memory use and avoids converting the values
+        out: str, optional
+            None (default) reads the data into memory, "memmap" reads
+            each item into a disk-backed np.memmap (for data larger than memory)
+        scratch_dir: str, optional
+            directory for the memmap scratch files, default the system temp directory
+        area: list[float] or np.array or shapely.geometry.Polygon, optional
+            Read only the elements with center inside a bounding box
+            [x0, y0, x1, y1] or polygon (vertices [n, 2]), see
+            get_elements_in_area. Cannot be combined with elements.
 
         Returns
         -------
         Dataset
             A dataset with data dimensions [t,elements]
+        UnstructuredGeometry
+            geometry of the elements in the area (only if area is given)
+
+        Examples
+        --------
+        >>> ds, geometry = dfs.read(area=[340000, 6150000, 350000, 6160000])
         """
+        if area is not None:
+            if elements is not None:
+                raise ValueError("elements and area cannot both be given")
+            elements = self.get_elements_in_area(area)
+            if len(elements) == 0:
+                raise ValueError("No elements in area")
+            ds = self.read(items, time_steps, elements, dtype, out, scratch_dir)
+            return ds, self.elements_to_geometry(elements)
+
+        if elements is not None:
+            elements = _wrap_negative_ids(elements, self.n_elements)
+
+        if self._backend == "numpy":
+            return self._read_numpy(
+                items, time_steps, elements, dtype, out, scratch_dir
+            )
 
         # Open the dfs file for reading
         # self._read_dfsu_header(self._filename)
@@ -1349,7 +2440,7 @@ class Dfsu(_UnstructuredFile):
         nt = self.n_timesteps  # .NumberOfTimeSteps
 
         items, item_numbers, time_steps = get_valid_items_and_timesteps(
-            self, items, time_steps
+            self, items, time_steps, source=dfs
         )
 
         n_items = len(item_numbers)
@@ -1371,13 +2462,22 @@ class Dfsu(_UnstructuredFile):
             # Initialize an empty data block
             if item == 0 and items[item].name == "Z coordinate":
                 item0_is_node_based = True
-                data = np.ndarray(shape=(len(time_steps), n_nodes), dtype=float)
+                shape = (len(time_steps), n_nodes)
             else:
-                data = np.ndarray(shape=(len(time_steps), n_elems), dtype=float)
+                shape = (len(time_steps), n_elems)
+            data = create_data_block(shape, dtype, out, scratch_dir)
             data_list.append(data)
 
         t_seconds = np.zeros(len(time_steps), dtype=float)
 
+        if elements is not None:
+            # only the selected values are transferred from .NET
+            element_plan = SubsetPlan(elements)
+            node_plan = SubsetPlan(node_ids)
+
+        buffers = BufferPool()
+        copy_to_data = np.dtype(dtype) == np.float32
+
         for i in range(len(time_steps)):
             it = time_steps[i]
             for item in range(n_items):
@@ -1386,17 +2486,23 @@ class Dfsu(_UnstructuredFile):
 
                 src = itemdata.Data
 
-                d = to_numpy(src)
+                if copy_to_data:
+                    # copy directly into the data block
+                    target = data_list[item][i]
+                else:
+                    target = buffers.get(data_list[item].shape[1], key=item)
 
-                d[d == deletevalue] = np.nan
+                if elements is None:
+                    d = to_numpy(src, out=target)
+                elif item == 0 and item0_is_node_based:
+                    d = to_numpy_subset(src, node_plan, out=target)
+                else:
+                    d = to_numpy_subset(src, element_plan, out=target)
 
-                if elements is not None:
-                    if item == 0 and item0_is_node_based:
-                        d = d[node_ids]
-                    else:
-                        d = d[elements]
+                d[d == deletevalue] = np.nan
 
-                data_list[item][i, :] = d
+                if not copy_to_data:
+                    data_list[item][i, :] = d
 
             t_seconds[i] = itemdata.Time
 
@@ -1405,6 +2511,158 @@ class Dfsu(_UnstructuredFile):
         dfs.Close()
         return Dataset(data_list, time, items)
 
+    def _read_numpy(self, items, time_steps, elements, dtype, out, scratch_dir):
+        raw = RawDfsFile(self._filename)
+        try:
+            # time may have changes since we read the header
+            self._n_timesteps = raw.n_timesteps
+
+            items, item_numbers, time_steps = get_valid_items_and_timesteps(
+                self, items, time_steps, source=raw
+            )
+
+            index = None
+            if elements is not None:
+                node_ids, _ = self._get_nodes_and_table_for_elements(elements)
+                index = {}
+                for item, item_number in enumerate(item_numbers):
+                    if item == 0 and items[item].name == "Z coordinate":
+                        index[item_number] = node_ids
+                    else:
+                        index[item_number] = elements
+
+            data_list = []
+            for item_number in item_numbers:
+                if index is None:
+                    n = raw.item_size(item_number)
+                else:
+                    n = len(index[item_number])
+                shape = (len(time_steps), n)
+                data_list.append(create_data_block(shape, dtype, out, scratch_dir))
+
+            raw.read(
+                item_numbers, time_steps, dtype=dtype, index=index, out=data_list
+            )
+            time = raw.get_time(time_steps)
+        finally:
+            raw.close()
+
+        return Dataset(data_list, time, items)
+
+    def iter_timesteps(
+        self, items=None, time_steps=None, elements=None, chunk=1, dtype=np.float64
+    ):
+        """
+        Iterate over the dfsu file in blocks of chunk time steps
+
+        The file is opened once and the data is read into buffers that
+        are reused for every block, so the memory use is bounded by the
+        chunk size, not by the number of time steps in the file.
+
+        Parameters
+        ---------
+        items: list[int] or list[str], optional
+            Read only selected items, by number (0-based), or by name
+        time_steps: int or list[int], optional
+            Read only selected time_steps
+        elements: list[int], optional
+            Read only selected element ids
+        chunk: int, optional
+            number of time steps in each block, default 1
+        dtype: np.dtype, optional
+            data type of the returned data, default np.float64
+
+        Yields
+        ------
+        list[datetime], dict
+            time of the time steps in the block and item name -> data with
+            dimensions [t,elements]. The arrays are overwritten by the
+            next block, copy them to keep them.
+
+        Examples
+        --------
+        >>> dfs = Dfsu("tests/testdata/HD2D.dfsu")
+        >>> for time, data in dfs.iter_timesteps(items=[0], chunk=4):
+        ...     print(time[0], data["Surface elevation"].max())
+        """
+        if elements is not None:
+            elements = _wrap_negative_ids(elements, self.n_elements)
+
+        if self._backend == "numpy":
+            source = RawDfsFile(self._filename)
+        else:
+            source = DfsuFile.Open(self._filename)
+
+        try:
+            if self._backend == "numpy":
+                self._n_timesteps = source.n_timesteps
+            else:
+                self._n_timesteps = source.NumberOfTimeSteps
+
+            items, item_numbers, time_steps = get_valid_items_and_timesteps(
+                self, items, time_steps, source=source
+            )
+
+            # value indices of each item (None: all values)
+            index = [None] * len(items)
+            shapes = []
+            for item in range(len(items)):
+                node_based = item == 0 and items[item].name == "Z coordinate"
+                n = self.n_nodes if node_based else self.n_elements
+                if elements is not None:
+                    if node_based:
+                        nodes, _ = self._get_nodes_and_table_for_elements(elements)
+                        index[item] = nodes
+                    else:
+                        index[item] = elements
+                    n = len(index[item])
+                shapes.append((n,))
+
+            if self._backend == "numpy":
+                times = source.time_in_seconds
+
+                def read_item_timestep(item, it, out):
+                    item_number = item_numbers[item]
+                    src = source.item_data(item_number)
+                    idx = index[item]
+                    out[:] = src[it] if idx is None else src[it, idx]
+                    deletevalue = source.item_deletevalue(item_number)
+                    if deletevalue is not None:
+                        out[out == deletevalue] = np.nan
+                    return times[it]
+
+            else:
+                deletevalue = self.deletevalue
+                buffers = BufferPool()
+
+                plans = [None if idx is None else SubsetPlan(idx) for idx in index]
+
+                def read_item_timestep(item, it, out):
+                    itemdata = source.ReadItemTimeStep(item_numbers[item] + 1, it)
+                    buffer = buffers.get(len(out), key=item)
+                    if plans[item] is None:
+                        d = to_numpy(itemdata.Data, out=buffer)
+                    else:
+                        d = to_numpy_subset(itemdata.Data, plans[item], out=buffer)
+                    d[d == deletevalue] = np.nan
+                    out[:] = d
+                    return itemdata.Time
+
+            yield from iter_timestep_blocks(
+                read_item_timestep,
+                items,
+                time_steps,
+                shapes,
+                self.start_time,
+                chunk,
+                dtype,
+            )
+        finally:
+            if self._backend == "numpy":
+                source.close()
+            else:
+                source.Close()
+
     def write(
         self,
         filename,
@@ -1510,12 +2768,7 @@ class Dfsu(_UnstructuredFile):
         # zn have to be Single precision??
         zn = to_dotnet_float_array(geometry.node_coordinates[:, 2])
 
-        elem_table = []
-        for j in range(geometry.n_elements):
-            elem_nodes = geometry.element_table[j]
-            elem_nodes = [nd + 1 for nd in elem_nodes]
-            elem_table.append(elem_nodes)
-        elem_table = asnetarray_v2(elem_table)
+        elem_table = geometry._element_table_to_dotnet()
 
         builder = DfsuBuilder.Create(dfsu_filetype)
 
@@ -1550,9 +2803,11 @@ class Dfsu(_UnstructuredFile):
             # Add data for all item-timesteps, copying from source
             for i in range(n_time_steps):
                 for item in range(n_items):
-                    d = data[item][i, :]
+                    # copy of a single time step, so data (e.g. a memmap) is
+                    # neither loaded nor modified
+                    d = data[item][i, :].astype(np.float32)
                     d[np.isnan(d)] = deletevalue
-                    darray = to_dotnet_float_array(d)
+                    darray = to_dotnet_array(d)
                     dfs.WriteItemTimeStepNext(0, darray)
             dfs.Close()
 
@@ -1570,7 +2825,6 @@ class Dfsu(_UnstructuredFile):
             path to file to be written
         """
         if self.is_2d:
-            _ = self.element_table  # make sure element table has been constructured
             geometry = self
         else:
             geometry = self.to_2d_geometry()
@@ -1578,6 +2832,145 @@ class Dfsu(_UnstructuredFile):
         Mesh._geometry_to_mesh(outfilename, geometry)
 
 
+    def to_dfs2(
+        self,
+        filename,
+        dx,
+        dy=None,
+        x0=None,
+        y0=None,
+        nx=None,
+        ny=None,
+        items=None,
+        time_steps=None,
+        method="nearest",
+        title=None,
+    ):
+        """Interpolate to a regular grid and write a dfs2 file
+
+        The interpolation weights are computed once and the time steps are
+        read, interpolated and written one at a time, so the memory use
+        does not depend on the number of time steps.
+        For 3d files the top layer is interpolated.
+
+        Parameters
+        ----------
+        filename: str
+            full path to the new dfs2 file
+        dx: float
+            grid spacing in the x direction (projection units)
+        dy: float, optional
+            grid spacing in the y direction, default dx
+        x0: float, optional
+            x coordinate of the center of the lower left cell,
+            default is the left edge of the mesh + dx/2
+        y0: float, optional
+            y coordinate of the center of the lower left cell,
+            default is the lower edge of the mesh + dy/2
+        nx: int, optional
+            number of cells in the x direction, default covers the mesh
+        ny: int, optional
+            number of cells in the y direction, default covers the mesh
+        items: list[int] or list[str], optional
+            Write only selected items, by number (0-based), or by name
+        time_steps: list[int], optional
+            Write only selected time_steps
+        method: str, optional
+            "nearest" (default): value of the element containing the
+            cell center, "linear": linear interpolation of the
+            node-centered values
+        title: str, optional
+            title of the dfs2 file. Default is blank.
+
+        Examples
+        --------
+        >>> dfs = Dfsu("tests/testdata/HD2D.dfsu")
+        >>> dfs.to_dfs2("HD2D.dfs2", dx=100, method="linear")
+        """
+        from .dfs2 import Dfs2
+
+        if dy is None:
+            dy = dx
+        xmin, ymin = self.node_coordinates[:, :2].min(axis=0)
+        xmax, ymax = self.node_coordinates[:, :2].max(axis=0)
+        if x0 is None:
+            x0 = xmin + dx / 2
+        if y0 is None:
+            y0 = ymin + dy / 2
+        if nx is None:
+            nx = max(int(np.ceil((xmax - x0) / dx + 0.5)), 1)
+        if ny is None:
+            ny = max(int(np.ceil((ymax - y0) / dy + 0.5)), 1)
+
+        xx, yy = np.meshgrid(x0 + dx * np.arange(nx), y0 + dy * np.arange(ny))
+        if self.is_2d:
+            geometry = self
+            elements = None
+        else:
+            geometry = self.geometry2d
+            elements = self.top_elements
+        interpolate = geometry._get_interpolant(xx.ravel(), yy.ravel(), method)
+
+        items, item_numbers, time_steps = get_valid_items_and_timesteps(
+            self, items, time_steps, source=self._get_source()
+        )
+        if not self.is_2d:
+            # the node based z coordinates are not interpolated
+            keep = [i for i, number in enumerate(item_numbers) if number > 0]
+            items = [items[i] for i in keep]
+            item_numbers = [item_numbers[i] for i in keep]
+
+        times = [
+            self.start_time + timedelta(seconds=self.timestep * it) for it in time_steps
+        ]
+        steps = np.diff(time_steps)
+        datetimes = None
+        if len(steps) > 0 and np.any(steps != steps[0]):
+            datetimes = times
+        dt = self.timestep * (steps[0] if len(steps) > 0 else 1)
+
+        blocks = self.iter_timesteps(
+            items=item_numbers, time_steps=time_steps, elements=elements
+        )
+        current = {"step": -1, "data": None}
+
+        def grid_values(item, step):
+            while current["step"] < step:
+                _, data = next(blocks)
+                current["step"] += 1
+                current["data"] = list(data.values())
+            d = interpolate(current["data"][item][0])
+            # row 0 is the top of the grid, as returned by Dfs2.read
+            return d.reshape(ny, nx)[::-1]
+
+        shape = (len(time_steps), ny, nx)
+        data = [
+            _LazyTimeSteps(lambda step, item=item: grid_values(item, step), shape)
+            for item in range(len(items))
+        ]
+
+        projection = "LONG/LAT" if self.is_geo else self.projection_string
+        coordinate = [projection, float(x0), float(y0), 0]
+        if title is None:
+            title = ""
+
+        try:
+            Dfs2().write(
+                filename,
+                data,
+                start_time=times[0],
+                dt=dt,
+                datetimes=datetimes,
+                items=items,
+                dx=dx,
+                dy=dy,
+                coordinate=coordinate,
+                title=title,
+            )
+        finally:
+            blocks.close()
+
+
 class Mesh(_UnstructuredFile):
     def __init__(self, filename):
         super().__init__()
@@ -1625,11 +3018,10 @@ class Mesh(_UnstructuredFile):
         if elements is None:
             geometry = self
             quantity = self._source.EumQuantity
-            elem_table = self._source.ElementTable
         else:
             geometry = self.elements_to_geometry(elements)
             quantity = eumQuantity.Create(EUMType.Bathymetry, EUMUnit.meter)
-            elem_table = geometry._element_table_to_dotnet()
+        elem_table = geometry._element_table_to_dotnet()
 
         nc = geometry.node_coordinates
         builder.SetNodes(nc[:, 0], nc[:, 1], nc[:, 2], geometry.codes)
@@ -1645,6 +3037,8 @@ class Mesh(_UnstructuredFile):
         """
         Plot mesh boundary nodes and their codes
         """
+        import matplotlib.pyplot as plt
+
         nc = self.node_coordinates
         c = self.codes
 
@@ -1,23 +1,166 @@
+import os
+import sys
+import platform
+import importlib
 import datetime
 import numpy as np
 import ctypes
-import clr
-import System
-from System.Runtime.InteropServices import GCHandle, GCHandleType
-
-_MAP_NP_NET = {
-    np.dtype("float32"): System.Single,
-    np.dtype("float64"): System.Double,
-    np.dtype("int8"): System.SByte,
-    np.dtype("int16"): System.Int16,
-    np.dtype("int32"): System.Int32,
-    np.dtype("int64"): System.Int64,
-    np.dtype("uint8"): System.Byte,
-    np.dtype("uint16"): System.UInt16,
-    np.dtype("uint32"): System.UInt32,
-    np.dtype("uint64"): System.UInt64,
-    np.dtype("bool"): System.Boolean,
-}
+
+_MIKEBIN = os.path.join(os.path.dirname(__file__), "bin")
+
+DFS_ASSEMBLIES = (
+    "DHI.Generic.MikeZero.DFS",
+    "DHI.Generic.MikeZero.EUM",
+    "DHI.Projections",
+    "System",
+    "System.Runtime.InteropServices",
+    "System.Runtime",
+)
+
+_references = set()
+
+
+def add_reference(*assemblies):
+    """Start the .NET runtime and add references to assemblies
+
+    The runtime is started on the first call (not when mikeio is imported)
+    and assemblies that are already referenced are skipped.
+
+    Parameters
+    ----------
+    assemblies: str
+        names of the assemblies, e.g. "DHI.Mike1D.Generic"
+    """
+    import clr
+
+    if _MIKEBIN not in sys.path:
+        p = platform.architecture()
+        if not "64" in p[0]:
+            raise Exception("This library has not been tested in a 32 bit system!!!!")
+        sys.path.append(_MIKEBIN)
+
+    for assembly in assemblies:
+        if assembly not in _references:
+            clr.AddReference(assembly)
+            _references.add(assembly)
+
+
+class LazyImport:
+    """.NET namespace or type imported on first use
+
+    Module level names like DfsFileFactory can be defined without
+    starting the .NET runtime; the assemblies are referenced and the
+    name is imported the first time an attribute is accessed or it is called.
+
+    Parameters
+    ----------
+    module: str
+        .NET namespace, e.g. "DHI.Generic.MikeZero.DFS"
+    name: str, optional
+        name of the type in the namespace, default the namespace itself
+    assemblies: tuple[str], optional
+        assemblies to reference before importing, default DFS_ASSEMBLIES
+
+    Examples
+    --------
+    >>> DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+    >>> dfs = DfsFileFactory.DfsGenericOpen(filename)  # runtime started here
+    """
+
+    def __init__(self, module, name=None, assemblies=DFS_ASSEMBLIES):
+        self._module = module
+        self._name = name
+        self._assemblies = assemblies
+        self._obj = None
+
+    def _load(self):
+        if self._obj is None:
+            add_reference(*self._assemblies)
+            obj = importlib.import_module(self._module)
+            if self._name is not None:
+                obj = getattr(obj, self._name)
+            self._obj = obj
+        return self._obj
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self._module if self._name is None else f"{self._module}.{self._name}"
+        return f"LazyImport({name})"
+
+
+System = LazyImport("System")
+
+
+_gchandle = None
+
+
+def _load_gchandle():
+    # resolved once, this is called for every transfer of data
+    global _gchandle
+    if _gchandle is None:
+        add_reference(*DFS_ASSEMBLIES)
+        from System.Runtime.InteropServices import GCHandle, GCHandleType
+
+        _gchandle = (GCHandle, GCHandleType)
+    return _gchandle
+
+
+_linq_methods = None
+
+
+def _linq_method(name, *type_args):
+    """Generic method of System.Linq.Enumerable, e.g. ToArray<T>
+
+    Select and SelectMany are the overloads with a Func<T, TResult>
+    selector, the other methods are the overloads with only a source.
+    """
+    global _linq_methods
+    if _linq_methods is None:
+        import clr
+
+        add_reference("System.Core")
+        from System.Linq import Enumerable
+
+        _linq_methods = {}
+        for method in clr.GetClrType(Enumerable).GetMethods():
+            params = method.GetParameters()
+            if params.Length == 2:
+                selector = params[1].ParameterType
+                if not selector.IsGenericType or selector.Name != "Func`2":
+                    continue
+            _linq_methods[method.Name, params.Length] = method
+    n_params = 2 if name.startswith("Select") else 1
+    return _linq_methods[name, n_params].MakeGenericMethod(*type_args)
+
+
+def _func_type(arg_type, result_type):
+    """.NET type Func<arg_type, result_type>"""
+    return System.Type.GetType("System.Func`2").MakeGenericType(arg_type, result_type)
+
+
+def _map_np_net(dtype):
+    return {
+        np.dtype("float32"): System.Single,
+        np.dtype("float64"): System.Double,
+        np.dtype("int8"): System.SByte,
+        np.dtype("int16"): System.Int16,
+        np.dtype("int32"): System.Int32,
+        np.dtype("int64"): System.Int64,
+        np.dtype("uint8"): System.Byte,
+        np.dtype("uint16"): System.UInt16,
+        np.dtype("uint32"): System.UInt32,
+        np.dtype("uint64"): System.UInt64,
+        np.dtype("bool"): System.Boolean,
+    }[dtype]
+
+
 _MAP_NET_NP = {
     "Single": np.dtype("float32"),
     "Double": np.dtype("float64"),
@@ -71,6 +214,7 @@ def asNumpyArray(x):
             "asNumpyArray does not yet support System type {}".format(netType)
         )
 
+    GCHandle, GCHandleType = _load_gchandle()
     try:  # Memmove
         sourceHandle = GCHandle.Alloc(x, GCHandleType.Pinned)
         sourcePtr = sourceHandle.AddrOfPinnedObject().ToInt64()
@@ -96,7 +240,7 @@ def to_dotnet_array(x):
         
     Notes
     -----
-    Given a `numpy.ndarray` returns a CLR `System.Array`.  See _MAP_NP_NET for 
+    Given a `numpy.ndarray` returns a CLR `System.Array`.  See _map_np_net for 
     the mapping of Numpy dtypes to CLR types.
     """
     dims = x.shape
@@ -107,12 +251,13 @@ def to_dotnet_array(x):
     assert x.flags.c_contiguous
 
     try:
-        netArray = System.Array.CreateInstance(_MAP_NP_NET[dtype], dims)
+        netArray = System.Array.CreateInstance(_map_np_net(dtype), dims)
     except KeyError:
         raise NotImplementedError(
             "asNetArray does not yet support dtype {}".format(dtype)
         )
 
+    GCHandle, GCHandleType = _load_gchandle()
     try:  # Memmove
         destHandle = GCHandle.Alloc(netArray, GCHandleType.Pinned)
         sourcePtr = x.__array_interface__["data"][0]
@@ -138,28 +283,211 @@ def to_dotnet_float_array(x):
     return to_dotnet_array(x.astype(np.float32))
 
 
-def to_numpy(src):
+def to_numpy(src, out=None):
     """
     Convert .NET array to numpy array
 
     Parameters
     ----------
     src : System.Array
-        
+        .NET array of single precision values
+    out : np.ndarray, optional
+        preallocated C-contiguous float32 array with the same number of
+        values as src, e.g. a reusable buffer or a slot in a data block
+
     Returns
     -------
     np.ndarray
-        
+        copy of the values in src (the array owns its memory)
+
+    Notes
+    -----
+    The values are copied with a single memmove while src is pinned,
+    so the returned array never points to .NET memory.
+    """
+    n = len(src)
+    if out is None:
+        out = np.empty(n, dtype=np.float32)
+    elif out.dtype != np.float32 or not out.flags.c_contiguous or out.size != n:
+        raise ValueError(
+            f"out must be a C-contiguous float32 array with {n} values"
+        )
+
+    GCHandle, GCHandleType = _load_gchandle()
+    src_hndl = GCHandle.Alloc(src, GCHandleType.Pinned)
+    try:
+        src_ptr = src_hndl.AddrOfPinnedObject().ToInt64()
+        ctypes.memmove(out.ctypes.data, src_ptr, out.nbytes)
+    finally:
+        if src_hndl.IsAllocated:
+            src_hndl.Free()
+
+    return out
+
+
+def to_numpy_subset(src, plan, out=None):
+    """
+    Copy a subset of the values of a .NET array to a numpy array
+
+    Parameters
+    ----------
+    src : System.Array
+        .NET array of single precision values
+    plan : mikeio.dutil.SubsetPlan
+        indices of the values to copy, coalesced into runs
+    out : np.ndarray, optional
+        preallocated C-contiguous float32 array with plan.size values
+
+    Returns
+    -------
+    np.ndarray
+        the values src[indices]
+
+    Notes
+    -----
+    Only the values in the subset are transferred, with one memmove per
+    run of consecutive indices while src is pinned.
     """
+    n = plan.size
+    if out is None:
+        out = np.empty(n, dtype=np.float32)
+    elif out.dtype != np.float32 or not out.flags.c_contiguous or out.size != n:
+        raise ValueError(f"out must be a C-contiguous float32 array with {n} values")
+    plan.check_bounds(len(src))
+
+    tmp = out if plan.order is None else np.empty(n, dtype=np.float32)
+    itemsize = tmp.itemsize
 
+    GCHandle, GCHandleType = _load_gchandle()
     src_hndl = GCHandle.Alloc(src, GCHandleType.Pinned)
     try:
         src_ptr = src_hndl.AddrOfPinnedObject().ToInt64()
-        bufType = ctypes.c_float * len(src)
-        cbuf = bufType.from_address(src_ptr)
-        d = np.frombuffer(cbuf, dtype=cbuf._type_)
+        dest_ptr = tmp.ctypes.data
+        for start, count, offset in zip(plan.starts, plan.counts, plan.offsets):
+            ctypes.memmove(
+                dest_ptr + int(offset) * itemsize,
+                src_ptr + int(start) * itemsize,
+                int(count) * itemsize,
+            )
     finally:
         if src_hndl.IsAllocated:
             src_hndl.Free()
 
-    return d
+    if plan.order is not None:
+        out[plan.order] = tmp
+    return out
+
+
+def to_numpy_jagged(src):
+    """
+    Convert a .NET jagged array (array of arrays) to flat numpy arrays
+
+    Parameters
+    ----------
+    src : System.Array
+        .NET array of 1d arrays, e.g. an element table with the
+        node ids of each element
+
+    Returns
+    -------
+    np.ndarray
+        values of all the arrays, one array after the other
+    np.ndarray(int64)
+        start of each array in the values (len(src) + 1 values)
+
+    Notes
+    -----
+    The arrays are concatenated on the .NET side by System.Linq with
+    delegates bound to .NET methods, so python is not called for each
+    array, and the result is transferred with a single memmove.
+    """
+    array_type = src.GetType().GetElementType()
+    value_type = array_type.GetElementType()
+    int_type = System.Type.GetType("System.Int32")
+    seq_type = System.Type.GetType("System.Collections.Generic.IEnumerable`1")
+
+    # Func<T[], IEnumerable<T>> and Func<T[], int> bound to Linq methods
+    as_sequence = System.Delegate.CreateDelegate(
+        _func_type(array_type, seq_type.MakeGenericType(value_type)),
+        _linq_method("AsEnumerable", value_type),
+    )
+    length = System.Delegate.CreateDelegate(
+        _func_type(array_type, int_type), _linq_method("Count", value_type)
+    )
+
+    values = _linq_method("SelectMany", array_type, value_type).Invoke(
+        None, [src, as_sequence]
+    )
+    values = _linq_method("ToArray", value_type).Invoke(None, [values])
+    counts = _linq_method("Select", array_type, int_type).Invoke(None, [src, length])
+    counts = _linq_method("ToArray", int_type).Invoke(None, [counts])
+
+    offsets = np.zeros(len(src) + 1, dtype=np.int64)
+    np.cumsum(asNumpyArray(counts), out=offsets[1:])
+    return asNumpyArray(values), offsets
+
+
+def to_dotnet_jagged(values, offsets):
+    """
+    Convert flat numpy arrays to a .NET jagged array (array of arrays)
+
+    Parameters
+    ----------
+    values : np.ndarray
+        values of all the arrays, one array after the other
+    offsets : np.ndarray
+        start of each array in the values (number of arrays + 1 values)
+
+    Returns
+    -------
+    System.Array
+        .NET array of 1d arrays with the data type of values
+
+    Notes
+    -----
+    The values are transferred with a single memmove, but the inner
+    arrays are still created and filled on the .NET side one by one.
+    """
+    flat = to_dotnet_array(np.ascontiguousarray(values))
+    value_type = _map_np_net(np.asarray(values).dtype)
+    array_type = System.Array.CreateInstance(value_type, 0).GetType()
+    n = len(offsets) - 1
+    jagged = System.Array.CreateInstance(array_type, n)
+    starts = offsets[:-1].tolist()
+    counts = np.diff(offsets).tolist()
+    for j, (start, count) in enumerate(zip(starts, counts)):
+        a = System.Array.CreateInstance(value_type, count)
+        System.Array.Copy(flat, start, a, 0, count)
+        jagged[j] = a
+    return jagged
+
+
+class BufferPool:
+    """Reusable float32 buffers for transferring item data from .NET
+
+    One buffer is kept per key (e.g. the item number), so reading many
+    timesteps does not allocate a new array for every item-timestep.
+    Note that the buffer is overwritten by the next transfer with the same key.
+
+    Examples
+    --------
+    >>> pool = BufferPool()
+    >>> for it in range(n_timesteps):
+    ...     itemdata = dfs.ReadItemTimeStep(1, it)
+    ...     d = pool.to_numpy(itemdata.Data)
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, n, key=None):
+        """Get buffer with n values for key (allocated on first use)"""
+        buf = self._buffers.get(key)
+        if buf is None or buf.size != n:
+            buf = np.empty(n, dtype=np.float32)
+            self._buffers[key] = buf
+        return buf
+
+    def to_numpy(self, src, key=None):
+        """Copy .NET array into the buffer for key and return the buffer"""
+        return to_numpy(src, out=self.get(len(src), key))
@@ -1,17 +1,25 @@
+import os
+import tempfile
+import weakref
 import numpy as np
 import pandas as pd
 from copy import deepcopy
+from datetime import timedelta
 from mikeio.eum import EUMType, EUMUnit, ItemInfo
+from mikeio.dfs_raw import RawDfsFile
 
 
-def get_valid_items_and_timesteps(dfs, items, time_steps):
+def get_valid_items_and_timesteps(dfs, items, time_steps, source=None):
     # TODO consider if this should be part of a DFS base class
+    # source: open file to look up the items in, default dfs._source
+    if source is None:
+        source = dfs._source
 
     if isinstance(items, int) or isinstance(items, str):
         items = [items]
 
     if items is not None and isinstance(items[0], str):
-        items = find_item(dfs._source, items)
+        items = find_item(source, items)
 
     if items is None:
         item_numbers = list(range(dfs._n_items))
@@ -24,7 +32,7 @@ def get_valid_items_and_timesteps(dfs, items, time_steps):
     if isinstance(time_steps, int):
         time_steps = [time_steps]
 
-    items = get_item_info(dfs._source, item_numbers)
+    items = get_item_info(source, item_numbers)
 
     return items, item_numbers, time_steps
 
@@ -34,7 +42,7 @@ def find_item(dfs, item_names):
 
     Parameters
     ----------
-    dfs : DfsFile
+    dfs : DfsFile or RawDfsFile
 
     item_names : list[str]
         Names of items to be found
@@ -49,7 +57,10 @@ def find_item(dfs, item_names):
     KeyError
         In case item is not found in the dfs file
     """
-    names = [x.Name for x in dfs.ItemInfo]
+    if isinstance(dfs, RawDfsFile):
+        names = [x.name for x in dfs.items]
+    else:
+        names = [x.Name for x in dfs.ItemInfo]
     item_lookup = {name: i for i, name in enumerate(names)}
     try:
         item_numbers = [item_lookup[x] for x in item_names]
@@ -64,13 +75,16 @@ def get_item_info(dfs, item_numbers):
 
     Parameters
     ----------
-    dfs : MIKE dfs object
+    dfs : MIKE dfs object or RawDfsFile
     item_numbers : list[int]
         
     Returns
     -------
     list[Iteminfo]
     """
+    if isinstance(dfs, RawDfsFile):
+        return dfs.get_item_info(item_numbers)
+
     items = []
     for item in item_numbers:
         name = dfs.ItemInfo[item].Name
@@ -83,6 +97,209 @@ def get_item_info(dfs, item_numbers):
     return items
 
 
+def create_data_block(shape, dtype, out=None, scratch_dir=None):
+    """Allocate an array for the data of an item
+
+    Parameters
+    ----------
+    shape: tuple[int]
+        shape of the array, e.g. (nt, n_elements)
+    dtype: np.dtype
+        data type of the array
+    out: str, optional
+        None (default) allocates the array in memory,
+        "memmap" creates a disk-backed np.memmap in a scratch file
+    scratch_dir: str, optional
+        directory for the scratch file, default the system temp directory
+
+    Returns
+    -------
+    np.ndarray or np.memmap
+
+    Notes
+    -----
+    The scratch file is removed when the memmap (and all views of it)
+    has been garbage collected.
+    """
+    if out is None:
+        return np.ndarray(shape=shape, dtype=dtype)
+    if out != "memmap":
+        raise ValueError(f"Invalid out '{out}'. Use None or 'memmap'")
+    if np.prod(shape) == 0:
+        return np.ndarray(shape=shape, dtype=dtype)
+
+    fd, filename = tempfile.mkstemp(suffix=".dat", prefix="mikeio_", dir=scratch_dir)
+    os.close(fd)
+    data = np.memmap(filename, dtype=dtype, mode="w+", shape=shape)
+    # the mmap is closed before the finalizer runs, so the file can be removed
+    weakref.finalize(data._mmap, _remove_scratch_file, filename)
+    return data
+
+
+class SubsetPlan:
+    """Plan for copying a subset of values as runs of consecutive values
+
+    The (sorted) indices are coalesced into runs, so a subset of e.g.
+    element ids can be copied with one slice (or memmove) per run and
+    the cost scales with the size of the subset.
+
+    Parameters
+    ----------
+    indices: array_like
+        indices (0-based) of the values in the subset, in the requested order
+
+    Attributes
+    ----------
+    starts, counts, offsets: np.array
+        first index, number of values and position in the sorted subset of each run
+    order: np.array or None
+        positions in the requested order of the sorted subset values,
+        None if the indices are already sorted
+
+    Examples
+    --------
+    >>> plan = SubsetPlan([4, 5, 6, 10, 11])
+    >>> plan.starts, plan.counts
+    (array([ 4, 10]), array([3, 2]))
+    """
+
+    def __init__(self, indices):
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        self.size = len(indices)
+
+        order = np.argsort(indices, kind="stable")
+        sorted_indices = indices[order]
+        if np.all(order == np.arange(self.size)):
+            order = None
+        self.order = order
+
+        breaks = np.flatnonzero(np.diff(sorted_indices) != 1) + 1
+        self.offsets = np.concatenate([[0], breaks]).astype(np.int64)
+        if self.size == 0:
+            self.offsets = self.offsets[:0]
+        self.starts = sorted_indices[self.offsets]
+        self.counts = np.diff(np.append(self.offsets, self.size))
+
+    @property
+    def n_runs(self):
+        """Number of runs of consecutive values"""
+        return len(self.starts)
+
+    def check_bounds(self, n):
+        """Raise IndexError if the subset is not within n values"""
+        if self.size > 0 and (
+            self.starts[0] < 0 or self.starts[-1] + self.counts[-1] > n
+        ):
+            raise IndexError(f"Subset index out of range for {n} values")
+
+    def take(self, src, out=None):
+        """Copy the subset of the values of src (1d) into out"""
+        self.check_bounds(len(src))
+        if out is None:
+            out = np.empty(self.size, dtype=src.dtype)
+        tmp = out if self.order is None else np.empty(self.size, dtype=out.dtype)
+        for start, count, offset in zip(self.starts, self.counts, self.offsets):
+            tmp[offset : offset + count] = src[start : start + count]
+        if self.order is not None:
+            out[self.order] = tmp
+        return out
+
+
+def iter_timestep_blocks(
+    read_item_timestep, items, time_steps, shapes, start_time, chunk, dtype
+):
+    """Generator of blocks of chunk time steps read into reused buffers
+
+    Parameters
+    ----------
+    read_item_timestep: callable
+        read_item_timestep(item, time_step, out) copies the values of
+        item (index in items) at time_step into out and returns the time
+        in seconds relative to start_time
+    items: list[ItemInfo]
+        items to read
+    time_steps: list[int]
+        time steps to read
+    shapes: list[tuple]
+        spatial shape of each item
+    start_time: datetime
+        start time of the file
+    chunk: int
+        number of time steps in each block
+    dtype: np.dtype
+        data type of the blocks
+
+    Yields
+    ------
+    list[datetime], dict
+        time of the time steps in the block and item name -> data with
+        dimensions [t, ...]. The arrays are overwritten by the next block.
+        Repeated item names get a suffix, e.g. "Untitled (2)".
+    """
+    if chunk < 1:
+        raise ValueError("chunk must be a positive number of time steps")
+
+    names = []
+    for item in items:
+        name = item.name
+        count = 1
+        while name in names:
+            count += 1
+            name = f"{item.name} ({count})"
+        names.append(name)
+
+    blocks = [np.empty((chunk,) + tuple(shape), dtype=dtype) for shape in shapes]
+    t_seconds = np.zeros(chunk)
+
+    for start in range(0, len(time_steps), chunk):
+        steps = time_steps[start : start + chunk]
+        for i, it in enumerate(steps):
+            for item in range(len(items)):
+                t_seconds[i] = read_item_timestep(item, it, blocks[item][i])
+
+        n = len(steps)
+        time = [start_time + timedelta(seconds=float(t)) for t in t_seconds[:n]]
+        yield time, {name: block[:n] for name, block in zip(names, blocks)}
+
+
+def _remove_scratch_file(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+def concat(datasets):
+    """Concatenate datasets along the time axis
+
+    Parameters
+    ----------
+    datasets: list[Dataset]
+        datasets with the same items and spatial dimensions, in time order
+
+    Returns
+    -------
+    Dataset
+    """
+    if len(datasets) == 0:
+        raise ValueError("At least one dataset is required for concatenation")
+    first = datasets[0]
+    for ds in datasets[1:]:
+        if [item.name for item in ds.items] != [item.name for item in first.items]:
+            raise ValueError("Datasets must have the same items to be concatenated")
+        if [d.shape[1:] for d in ds.data] != [d.shape[1:] for d in first.data]:
+            raise ValueError(
+                "Datasets must have the same spatial dimensions to be concatenated"
+            )
+
+    data = [
+        np.concatenate([ds.data[i] for ds in datasets], axis=0)
+        for i in range(len(first.items))
+    ]
+    time = [t for ds in datasets for t in ds.time]
+    return Dataset(data, time, deepcopy(first.items))
+
+
 class Dataset:
     """Dataset
 
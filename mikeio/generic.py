@@ -2,12 +2,19 @@ import os
 import numpy as np
 from datetime import datetime, timedelta
 
-from DHI.Generic.MikeZero.DFS import DfsFileFactory, DfsBuilder
-from .dotnet import to_numpy, to_dotnet_float_array, from_dotnet_datetime
+from .dotnet import (
+    LazyImport,
+    BufferPool,
+    to_dotnet_float_array,
+    from_dotnet_datetime,
+)
 from .helpers import safe_length
 from .dutil import find_item
 from shutil import copyfile
 
+DfsFileFactory = LazyImport("DHI.Generic.MikeZero.DFS", "DfsFileFactory")
+DfsBuilder = LazyImport("DHI.Generic.MikeZero.DFS", "DfsBuilder")
+
 
 def _clone(infilename, outfilename):
     """Clone a dfs file
@@ -102,12 +109,14 @@ def scale(
 
     deletevalue = dfs.FileInfo.DeleteValueFloat
 
+    buffers = BufferPool()
+
     for timestep in range(n_time_steps):
         for item in range(n_items):
 
             itemdata = dfs.ReadItemTimeStep(item_numbers[item] + 1, timestep)
             time = itemdata.Time
-            d = to_numpy(itemdata.Data)
+            d = buffers.to_numpy(itemdata.Data, key=item)
             d[d == deletevalue] = np.nan
 
             outdata = d * factor + offset
@@ -142,14 +151,17 @@ def sum(infilename_a, infilename_b, outfilename):
     n_items = safe_length(dfs_i_a.ItemInfo)
     # TODO Add checks to verify identical structure of file a and b
 
+    buffers_a = BufferPool()
+    buffers_b = BufferPool()
+
     for timestep in range(n_time_steps):
         for item in range(n_items):
 
             itemdata_a = dfs_i_a.ReadItemTimeStep(item + 1, timestep)
-            d_a = to_numpy(itemdata_a.Data)
+            d_a = buffers_a.to_numpy(itemdata_a.Data, key=item)
 
             itemdata_b = dfs_i_b.ReadItemTimeStep(item + 1, timestep)
-            d_b = to_numpy(itemdata_b.Data)
+            d_b = buffers_b.to_numpy(itemdata_b.Data, key=item)
             time = itemdata_a.Time
 
             outdata = d_a + d_b
@@ -186,14 +198,17 @@ def diff(infilename_a, infilename_b, outfilename):
     n_items = safe_length(dfs_i_a.ItemInfo)
     # TODO Add checks to verify identical structure of file a and b
 
+    buffers_a = BufferPool()
+    buffers_b = BufferPool()
+
     for timestep in range(n_time_steps):
         for item in range(n_items):
 
             itemdata_a = dfs_i_a.ReadItemTimeStep(item + 1, timestep)
-            d_a = to_numpy(itemdata_a.Data)
+            d_a = buffers_a.to_numpy(itemdata_a.Data, key=item)
 
             itemdata_b = dfs_i_b.ReadItemTimeStep(item + 1, timestep)
-            d_b = to_numpy(itemdata_b.Data)
+            d_b = buffers_b.to_numpy(itemdata_b.Data, key=item)
             time = itemdata_a.Time
 
             outdata = d_a - d_b
@@ -234,6 +249,8 @@ def concat(infilenames, outfilename):
 
     current_time = datetime(1, 1, 1)  # beginning of time...
 
+    buffers = BufferPool()
+
     for i, infilename in enumerate(infilenames):
 
         dfs_i = DfsFileFactory.DfsGenericOpen(infilename)
@@ -266,7 +283,7 @@ def concat(infilenames, outfilename):
             for item in range(n_items):
 
                 itemdata = dfs_i.ReadItemTimeStep(item + 1, timestep)
-                d = to_numpy(itemdata.Data)
+                d = buffers.to_numpy(itemdata.Data, key=item)
 
                 darray = to_dotnet_float_array(d)
 
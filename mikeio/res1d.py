@@ -2,17 +2,15 @@ from collections import defaultdict, namedtuple
 from contextlib import contextmanager
 import functools
 
-import clr
 import os.path
 import pandas as pd
 
-clr.AddReference("DHI.Mike1D.ResultDataAccess")
-from DHI.Mike1D.ResultDataAccess import ResultData  # noqa
+from .dotnet import LazyImport
 
-clr.AddReference("DHI.Mike1D.Generic")
-from DHI.Mike1D.Generic import Connection  # noqa
+_ASSEMBLIES = ("DHI.Mike1D.ResultDataAccess", "DHI.Mike1D.Generic", "System")
 
-clr.AddReference("System")
+ResultData = LazyImport("DHI.Mike1D.ResultDataAccess", "ResultData", _ASSEMBLIES)
+Connection = LazyImport("DHI.Mike1D.Generic", "Connection", _ASSEMBLIES)
 
 # Data types handled by the read function.
 DATA_TYPES_HANDLED_IN_QUERIES = [
@@ -33,4 +33,128 @@ def _get_dist_geo(lon, lat, lon1, lat1):
     x = dlon*np.cos(np.deg2rad((lat+lat1)/2))
     y = dlat
     d = R * np.sqrt(np.square(x) + np.square(y) )
-    return d
\ No newline at end of file
+    return d
+
+
+def points_in_polygon(x, y, polygon):
+    """Test which of the points (x, y) are inside the polygon
+
+    The crossing number (even-odd rule) is computed for all points at
+    once, one polygon edge at a time.
+
+    Parameters
+    ----------
+    x, y : np.array
+        coordinates of the points
+    polygon : np.array
+        vertices of the polygon [n, 2], the last vertex may repeat the first
+
+    Returns
+    -------
+    np.array(bool)
+        True for the points inside the polygon
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    polygon = np.asarray(polygon, dtype=np.float64)
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    inside = np.zeros(len(x), dtype=bool)
+    for xa, ya, xb, yb in zip(x1, y1, x2, y2):
+        # points whose horizontal ray to the right crosses the edge
+        crosses = np.flatnonzero((ya > y) != (yb > y))
+        xc = xa + (y[crosses] - ya) * (xb - xa) / (yb - ya)
+        inside[crosses] ^= x[crosses] < xc
+    return inside
+
+
+class BoxBuckets:
+    """Uniform grid of buckets for finding the boxes that may contain a point
+
+    Each bucket holds the boxes whose bounding box overlaps it, so
+    a point only has to be tested against the boxes of its bucket.
+
+    Parameters
+    ----------
+    xmin, ymin, xmax, ymax : np.array
+        bounding box of each box (e.g. of each mesh element)
+    n_buckets : int, optional
+        approximate number of buckets, default: the number of boxes
+    """
+
+    def __init__(self, xmin, ymin, xmax, ymax, n_buckets=None):
+        self._xmin = np.asarray(xmin, dtype=np.float64)
+        self._ymin = np.asarray(ymin, dtype=np.float64)
+        self._xmax = np.asarray(xmax, dtype=np.float64)
+        self._ymax = np.asarray(ymax, dtype=np.float64)
+        n_boxes = len(self._xmin)
+        if n_buckets is None:
+            n_buckets = n_boxes
+
+        self._x0 = self._xmin.min()
+        self._y0 = self._ymin.min()
+        width = max(self._xmax.max() - self._x0, 1e-12)
+        height = max(self._ymax.max() - self._y0, 1e-12)
+        self._size = np.sqrt(width * height / max(n_buckets, 1))
+        self._nx = int(np.ceil(width / self._size))
+        self._ny = int(np.ceil(height / self._size))
+
+        i0, j0 = self._cell(self._xmin, self._ymin)
+        i1, j1 = self._cell(self._xmax, self._ymax)
+        ni = i1 - i0 + 1
+        counts = ni * (j1 - j0 + 1)
+
+        # all (box, bucket) pairs sorted by bucket
+        boxes = np.repeat(np.arange(n_boxes), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        ii = i0[boxes] + local % ni[boxes]
+        jj = j0[boxes] + local // ni[boxes]
+        buckets = jj * self._nx + ii
+        order = np.argsort(buckets, kind="stable")
+        self._boxes = boxes[order]
+        self._offsets = np.zeros(self._nx * self._ny + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(buckets, minlength=self._nx * self._ny),
+            out=self._offsets[1:],
+        )
+
+    def _cell(self, x, y):
+        i = np.floor((x - self._x0) / self._size).astype(np.int64)
+        j = np.floor((y - self._y0) / self._size).astype(np.int64)
+        return np.clip(i, 0, self._nx - 1), np.clip(j, 0, self._ny - 1)
+
+    def candidates(self, x, y):
+        """Boxes whose bounding box contains each of the points
+
+        Parameters
+        ----------
+        x, y : np.array
+            coordinates of the points
+
+        Returns
+        -------
+        np.array(int)
+            point index of each (point, box) pair
+        np.array(int)
+            box index of each (point, box) pair
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        i, j = self._cell(x, y)
+        bucket = j * self._nx + i
+        starts = self._offsets[bucket]
+        counts = self._offsets[bucket + 1] - starts
+
+        points = np.repeat(np.arange(len(x)), counts)
+        idx = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        idx += np.arange(counts.sum())
+        boxes = self._boxes[idx]
+
+        inside = (
+            (x[points] >= self._xmin[boxes])
+            & (x[points] <= self._xmax[boxes])
+            & (y[points] >= self._ymin[boxes])
+            & (y[points] <= self._ymax[boxes])
+        )
+        return points[inside], boxes[inside]
@@ -2,17 +2,19 @@ from collections import defaultdict, namedtuple
 from contextlib import contextmanager
 import functools
 
-import clr
 import os.path
 import pandas as pd
 
-clr.AddReference("DHI.Mike1D.CrossSectionModule")
-from DHI.Mike1D.CrossSectionModule import CrossSectionDataFactory
+from .dotnet import LazyImport
 
-clr.AddReference("DHI.Mike1D.Generic")
-from DHI.Mike1D.Generic import Connection, Diagnostics, Location
+_ASSEMBLIES = ("DHI.Mike1D.CrossSectionModule", "DHI.Mike1D.Generic", "System")
 
-clr.AddReference("System")
+CrossSectionDataFactory = LazyImport(
+    "DHI.Mike1D.CrossSectionModule", "CrossSectionDataFactory", _ASSEMBLIES
+)
+Connection = LazyImport("DHI.Mike1D.Generic", "Connection", _ASSEMBLIES)
+Diagnostics = LazyImport("DHI.Mike1D.Generic", "Diagnostics", _ASSEMBLIES)
+Location = LazyImport("DHI.Mike1D.Generic", "Location", _ASSEMBLIES)
 
 class BaseXns11Error(Exception):
     """Base class for Xns11 errors."""
@@ -3,7 +3,7 @@ from dateutil.rrule import rrule, SECONDLY
 import numpy as np
 import pandas as pd
 import pytest
-from mikeio.dutil import Dataset
+from mikeio.dutil import Dataset, SubsetPlan
 from mikeio.eum import EUMType, ItemInfo, EUMUnit
 
 
@@ -308,3 +308,22 @@ def test_item_search():
 
     assert len(res) > 0
     assert isinstance(res[0], EUMType)
+
+
+def test_subset_plan_coalesces_runs():
+
+    plan = SubsetPlan([4, 5, 6, 10, 11])
+
+    assert plan.n_runs == 2
+    assert plan.order is None
+    np.testing.assert_array_equal(plan.take(np.arange(20)), [4, 5, 6, 10, 11])
+
+
+def test_subset_plan_keeps_requested_order():
+
+    plan = SubsetPlan([10, 4, 5, 5])
+
+    np.testing.assert_array_equal(plan.take(np.arange(20)), [10, 4, 5, 5])
+
+    with pytest.raises(IndexError):
+        plan.take(np.arange(8))
@@ -127,3 +127,29 @@ def test_read_names_access():
     assert res.items[0].name == "testing water level"
     assert res.items[0].type == EUMType.Water_Level
     assert res.items[0].unit == EUMUnit.meter
+
+
+def test_read_float32():
+
+    filename = r"tests/testdata/random.dfs1"
+    dfs = Dfs1(filename)
+
+    ds = dfs.read(dtype=np.float32)
+
+    assert ds.data[0].dtype == np.float32
+    assert ds.data[0].shape == (100, 3)  # time, x
+
+
+def test_iter_timesteps():
+
+    filename = r"tests/testdata/random.dfs1"
+    dfs = Dfs1(filename)
+    ds = dfs.read()
+
+    blocks = []
+    for time, data in dfs.iter_timesteps(chunk=40):
+        assert len(time) == data["testing water level"].shape[0]
+        blocks.append(data["testing water level"].copy())
+
+    assert [len(b) for b in blocks] == [40, 40, 20]
+    np.testing.assert_array_equal(np.concatenate(blocks), ds.data[0])
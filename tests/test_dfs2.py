@@ -112,6 +112,32 @@ def test_read():
     assert data.shape == (3, 100, 2)  # time, y, x
 
 
+def test_read_float32():
+
+    filename = r"tests/testdata/random.dfs2"
+    dfs = Dfs2(filename)
+    ds = dfs.read(dtype=np.float32)
+    data = ds.data[0]
+    assert data.dtype == np.float32
+    assert data[0, 11, 0] == 0
+    assert np.isnan(data[0, 10, 0])
+
+
+def test_iter_timesteps():
+
+    filename = r"tests/testdata/random.dfs2"
+    dfs = Dfs2(filename)
+    ds = dfs.read()
+
+    blocks = []
+    for time, data in dfs.iter_timesteps(chunk=2):
+        assert len(time) == data["testing water level"].shape[0]
+        blocks.append(data["testing water level"].copy())
+
+    assert [len(b) for b in blocks] == [2, 1]
+    np.testing.assert_array_equal(np.concatenate(blocks), ds.data[0])
+
+
 def test_read_item_names():
 
     filename = r"tests/testdata/random.dfs2"
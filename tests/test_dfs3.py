@@ -16,6 +16,16 @@ def test_read_dfs3():
     assert ds.items[0].name == "Untitled"
 
 
+def test_read_dfs3_memmap(tmpdir):
+    dfs = Dfs3("tests/testdata/Grid1.dfs3")
+    ds = dfs.read(layers=[1, 2])
+    dsm = dfs.read(layers=[1, 2], out="memmap", scratch_dir=tmpdir.strpath)
+
+    assert isinstance(dsm.data[0], np.memmap)
+    assert dsm.data[0].shape == (30, 2, 10, 10)
+    np.testing.assert_array_equal(dsm.data[0], ds.data[0])
+
+
 def test_write_single_item(tmpdir):
 
     outfilename = os.path.join(tmpdir.dirname, "simple.dfs3")
@@ -0,0 +1,157 @@
+import datetime
+import numpy as np
+import pytest
+
+import mikeio
+from mikeio.dfs_raw import RawDfsFile
+from mikeio.dfs0 import Dfs0
+from mikeio.dfs1 import Dfs1
+from mikeio.dfs2 import Dfs2
+from mikeio.dfs3 import Dfs3
+from mikeio.dfsu import Dfsu
+
+
+def test_raw_dfsu_header():
+
+    raw = RawDfsFile("tests/testdata/HD2D.dfsu")
+
+    assert raw.n_items == 4
+    assert raw.n_timesteps == 9
+    assert raw.items[0].name == "Surface elevation"
+    assert raw.start_time == datetime.datetime(1985, 8, 6, 7, 0, 0)
+    assert raw.timestep == 9000.0
+    assert raw.static_items["X-coord"].shape == (529,)
+
+
+def test_raw_item_data_is_view_of_file():
+
+    raw = RawDfsFile("tests/testdata/HD2D.dfsu")
+
+    data = raw.item_data(0)
+
+    assert data.shape == (9, 884)
+    assert isinstance(data, np.memmap)
+    assert not data.flags.writeable
+
+
+def test_raw_non_equidistant_time():
+
+    raw = RawDfsFile("tests/testdata/da_diagnostic.dfs0")
+
+    assert not raw.is_equidistant
+    assert raw.n_timesteps == 744
+    np.testing.assert_array_equal(raw.time_in_seconds[:3], [0.0, 600.0, 1200.0])
+
+
+def test_unknown_backend():
+
+    with pytest.raises(ValueError):
+        Dfsu("tests/testdata/HD2D.dfsu", backend="fortran")
+
+
+def test_read_dfs0_numpy_backend():
+
+    filename = "tests/testdata/random.dfs0"
+    ds = Dfs0(filename).read()
+    dsnp = Dfs0(filename, backend="numpy").read()
+
+    assert all(dsnp.time == ds.time)
+    assert dsnp.items[1].name == ds.items[1].name
+    np.testing.assert_array_equal(dsnp.data[1], ds.data[1])
+
+
+def test_read_dfs1_numpy_backend():
+
+    filename = "tests/testdata/random.dfs1"
+    dfs = Dfs1(filename, backend="numpy")
+    ds = Dfs1(filename).read()
+    dsnp = dfs.read()
+
+    assert all(dsnp.time == ds.time)
+    np.testing.assert_array_equal(dsnp.data[0], ds.data[0])
+
+
+def test_read_dfs2_numpy_backend():
+
+    filename = "tests/testdata/random.dfs2"
+    ds = Dfs2(filename).read(["testing water level"], time_steps=[1, 2])
+    dsnp = Dfs2(filename, backend="numpy").read(
+        ["testing water level"], time_steps=[1, 2]
+    )
+
+    assert dsnp.data[0].shape == ds.data[0].shape
+    assert all(dsnp.time == ds.time)
+    np.testing.assert_array_equal(dsnp.data[0], ds.data[0])
+
+
+def test_dfs2_find_nearest_element_numpy_backend():
+
+    dfs = Dfs2("tests/testdata/gebco_sound.dfs2", backend="numpy")
+
+    with pytest.raises(NotImplementedError, match="dotnet"):
+        dfs.find_nearest_element(lon=12.74792, lat=55.865)
+
+
+def test_read_dfs3_numpy_backend():
+
+    filename = "tests/testdata/Grid1.dfs3"
+    ds = Dfs3(filename).read(layers=[0, 1])
+    dsnp = Dfs3(filename, backend="numpy").read(layers=[0, 1])
+
+    assert dsnp.data[0].shape == ds.data[0].shape
+    np.testing.assert_array_equal(dsnp.data[0], ds.data[0])
+
+
+def test_read_dfsu_numpy_backend():
+
+    filename = "tests/testdata/oresund_sigma_z.dfsu"
+    dfs = Dfsu(filename)
+    dfsnp = Dfsu(filename, backend="numpy")
+
+    assert dfsnp.type_name == dfs.type_name
+    assert dfsnp.n_layers == dfs.n_layers
+    np.testing.assert_array_equal(dfsnp.top_elements, dfs.top_elements)
+    np.testing.assert_allclose(dfsnp.element_coordinates, dfs.element_coordinates)
+
+    elements = [0, 1, 2, 10]
+    ds = dfs.read(elements=elements)
+    dsnp = dfsnp.read(elements=elements)
+
+    assert dsnp.data[0].shape == ds.data[0].shape
+    for d, dnp in zip(ds.data, dsnp.data):
+        np.testing.assert_array_equal(dnp, d)
+
+
+def test_read_numpy_backend_float32():
+
+    ds = mikeio.read("tests/testdata/HD2D.dfsu", dtype=np.float32, backend="numpy")
+
+    assert ds.data[0].dtype == np.float32
+    assert ds.data[0].shape == (9, 884)
+
+
+def test_iter_timesteps_invalid_item_closes_file(monkeypatch):
+
+    dfs = Dfsu("tests/testdata/HD2D.dfsu", backend="numpy")
+    dfs2 = Dfs2("tests/testdata/random.dfs2", backend="numpy")
+    source = dfs._source
+
+    closed = []
+    close = RawDfsFile.close
+
+    def tracked_close(self):
+        closed.append(self)
+        close(self)
+
+    monkeypatch.setattr(RawDfsFile, "close", tracked_close)
+
+    with pytest.raises(KeyError):
+        next(dfs.iter_timesteps(items=["bogus"]))
+
+    assert len(closed) == 1
+    assert dfs._source is source
+
+    with pytest.raises(KeyError):
+        next(dfs2.iter_timesteps(items=["bogus"]))
+
+    assert len(closed) == 2
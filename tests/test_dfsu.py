@@ -1,12 +1,13 @@
 import os
 from shutil import copyfile
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytest
 
-from mikeio import Dfsu, Mesh, Dfs0
+from mikeio import Dfsu, Mesh, Dfs0, Dfs2
 from mikeio.eum import ItemInfo
 from mikeio.dutil import Dataset
+from mikeio.dfsu import _UnstructuredGeometry
 
 
 def test_read_all_items_returns_all_items_and_names():
@@ -96,6 +97,80 @@ def test_read_returns_array_time_dimension_first():
     assert ds.data[0].shape == (9, 884)
 
 
+def test_read_float32():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+
+    ds64 = dfs.read([3])
+    ds32 = dfs.read([3], dtype=np.float32)
+
+    assert ds32.data[0].dtype == np.float32
+    assert ds32.data[0].shape == (9, 884)
+    np.testing.assert_array_equal(ds32.data[0], ds64.data[0].astype(np.float32))
+
+
+def test_read_float32_elements():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+
+    ds = dfs.read([3], elements=[4, 100], dtype=np.float32)
+
+    assert ds.data[0].dtype == np.float32
+    assert ds.data[0].shape == (9, 2)
+
+
+def test_read_memmap(tmpdir):
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+
+    ds = dfs.read([0, 3])
+    dsm = dfs.read([0, 3], out="memmap", scratch_dir=tmpdir.strpath)
+
+    assert isinstance(dsm.data[0], np.memmap)
+    assert os.path.dirname(dsm.data[0].filename) == tmpdir.strpath
+    np.testing.assert_array_equal(dsm.data[1], ds.data[1])
+
+    df = dsm.isel(100, axis=1).to_dataframe()
+    assert df.shape == (9, 2)
+
+
+def test_iter_timesteps_elements():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    elements = [0, 5, 7]
+    ds = dfs.read(elements=elements)
+
+    times = []
+    salinity = []
+    for time, data in dfs.iter_timesteps(elements=elements, chunk=2):
+        times.extend(time)
+        salinity.append(data["Salinity"].copy())
+        assert data["Z coordinate"].shape[1] == ds["Z coordinate"].shape[1]
+
+    assert times == list(ds.time)
+    np.testing.assert_array_equal(np.concatenate(salinity), ds["Salinity"])
+
+
+def test_read_unsorted_elements():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+
+    ds = dfs.read([3])
+    dssub = dfs.read([3], elements=[100, 4, 5, 6])
+
+    np.testing.assert_array_equal(dssub.data[0], ds.data[0][:, [100, 4, 5, 6]])
+
+
+def test_read_negative_elements():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+
+    ds = dfs.read([3])
+    dssub = dfs.read([3], elements=[-1, 0])
+
+    np.testing.assert_array_equal(dssub.data[0], ds.data[0][:, [-1, 0]])
+
+
 def test_read_selected_item_returns_correct_items():
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
     dfs = Dfsu(filename)
@@ -130,6 +205,45 @@ def test_read_returns_correct_items_sigma_z():
     assert ds.items[2].name == "Salinity"
 
 
+def test_read_area_bbox():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    bbox = [340000, 6150000, 350000, 6160000]
+
+    ds, geometry = dfs.read(items=[0, 1], area=bbox)
+
+    elements = dfs.get_elements_in_area(bbox)
+    ec = dfs.element_coordinates[elements]
+    assert np.all((ec[:, 0] >= 340000) & (ec[:, 0] <= 350000))
+    assert np.all((ec[:, 1] >= 6150000) & (ec[:, 1] <= 6160000))
+    assert geometry.n_elements == len(elements)
+    assert ds.data[0].shape[1] == geometry.n_nodes  # z coordinate
+    assert ds.data[1].shape[1] == geometry.n_elements
+    np.testing.assert_array_equal(
+        ds.data[1], dfs.read(items=[1], elements=elements).data[0]
+    )
+
+
+def test_read_area_polygon():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    x0, y0 = dfs.node_coordinates[:, :2].min(axis=0)
+    x1, y1 = dfs.node_coordinates[:, :2].max(axis=0)
+    triangle = [[x0, y0], [x1, y0], [x0, y1]]
+
+    ds, geometry = dfs.read(items=[0], area=triangle)
+
+    ec = geometry.element_coordinates
+    assert ds.data[0].shape[1] == geometry.n_elements
+    assert np.all((ec[:, 0] - x0) / (x1 - x0) + (ec[:, 1] - y0) / (y1 - y0) <= 1)
+
+    with pytest.raises(ValueError):
+        dfs.read(area=triangle, elements=[0, 1])
+
+    with pytest.raises(ValueError):
+        dfs.read(area=[0, 0, 1, 1])
+
+
 def test_read_all_time_steps():
 
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
@@ -204,6 +318,56 @@ def test_get_element_coords():
     assert ec[1, 1] == pytest.approx(6906790.5928664245)
 
 
+def test_geometry_cache(tmpdir):
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    cache_dir = os.path.join(tmpdir, "cache")
+    dfs = Dfsu(filename)
+
+    Dfsu(filename, cache_dir=cache_dir)
+    cached = Dfsu(filename, cache_dir=cache_dir)
+
+    assert isinstance(cached.node_coordinates, np.memmap)
+    assert cached.type_name == dfs.type_name
+    assert cached.n_timesteps == dfs.n_timesteps
+    assert cached.items[0].name == dfs.items[0].name
+    np.testing.assert_array_equal(cached.top_elements, dfs.top_elements)
+    np.testing.assert_allclose(cached.element_coordinates, dfs.element_coordinates)
+    ds = cached.read(items=[1], time_steps=[0])
+    assert ds.data[0].shape == (1, dfs.n_elements)
+
+
+def test_geometry_cache_read_item_names(tmpdir):
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    cache_dir = os.path.join(tmpdir, "cache")
+    ds = Dfsu(filename).read(items=["Surface elevation"], time_steps=[0])
+
+    Dfsu(filename, cache_dir=cache_dir)
+    cached = Dfsu(filename, cache_dir=cache_dir)
+    dscached = cached.read(items=["Surface elevation"], time_steps=[0])
+
+    assert dscached.items[0].name == "Surface elevation"
+    np.testing.assert_array_equal(dscached.data[0], ds.data[0])
+
+    # the cached arrays can be modified like the arrays read from the file
+    cached.node_coordinates[0, 2] = 1.0
+    assert Dfsu(filename, cache_dir=cache_dir).node_coordinates[0, 2] != 1.0
+
+
+def test_geometry_cache_mesh(tmpdir):
+    filename = os.path.join("tests", "testdata", "odense_rough.mesh")
+    cache_dir = os.path.join(tmpdir, "cache")
+    msh = Dfsu(filename)
+
+    Dfsu(filename, cache_dir=cache_dir)
+    cached = Dfsu(filename, cache_dir=cache_dir)
+
+    assert isinstance(cached.node_coordinates, np.memmap)
+    assert cached.n_elements == msh.n_elements
+    assert cached.items is None
+    assert cached.start_time is None
+    np.testing.assert_allclose(cached.element_coordinates, msh.element_coordinates)
+
+
 def test_find_nearest_element_2d():
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
     dfs = Dfsu(filename)
@@ -267,6 +431,153 @@ def test_find_nearest_element_2d_array():
     assert elem_ids[1] == 317
 
 
+def test_find_nearest_element_many_points():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    expected = np.arange(0, dfs.n_elements, 50)
+    ec = dfs.element_coordinates[expected]
+
+    elem_ids = dfs.find_nearest_element(ec[:, 0] + 1.0, ec[:, 1] - 1.0)
+
+    np.testing.assert_array_equal(elem_ids, expected)
+
+
+def test_find_nearest_element_geo():
+    filename = os.path.join("tests", "testdata", "wind_north_sea.dfsu")
+    dfs = Dfsu(filename)
+    x = np.array([-1.0, 2.0, 5.5])
+    y = np.array([52.0, 55.0, 58.3])
+
+    elem_ids = dfs.find_nearest_element(x, y)
+
+    ec = np.deg2rad(dfs.element_coordinates[:, :2])
+    for j in range(len(x)):
+        lon, lat = np.deg2rad(x[j]), np.deg2rad(y[j])
+        a = (
+            np.sin((ec[:, 1] - lat) / 2) ** 2
+            + np.cos(lat) * np.cos(ec[:, 1]) * np.sin((ec[:, 0] - lon) / 2) ** 2
+        )
+        assert elem_ids[j] == np.argmin(a)
+
+
+def test_2d_to_3d_association():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    top = dfs.top_elements
+    bot = dfs.bottom_elements
+
+    np.testing.assert_array_equal(dfs.elem2d_ids[top], np.arange(len(top)))
+    np.testing.assert_array_equal(dfs.elem2d_ids[bot], np.arange(len(top)))
+    assert all(dfs.layer_ids[top] == dfs.n_layers)
+    np.testing.assert_array_equal(
+        dfs.layer_ids[bot], dfs.n_layers - dfs.n_layers_per_column + 1
+    )
+    np.testing.assert_array_equal(dfs.e2_e3_table[10], np.arange(bot[10], top[10] + 1))
+
+
+def test_elements_to_geometry_top_elements():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    first = dfs.bottom_elements[10]
+    elements = np.arange(first, dfs.top_elements[50] + 1)
+
+    geom = dfs.elements_to_geometry(elements)
+
+    np.testing.assert_array_equal(geom.top_elements, dfs.top_elements[10:51] - first)
+    assert geom.top_elements[-1] == geom.n_elements - 1
+
+
+def test_find_containing_element():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    ec = dfs.element_coordinates
+
+    elem_ids = dfs.find_containing_element(ec[:, 0], ec[:, 1])
+
+    np.testing.assert_array_equal(elem_ids, np.arange(dfs.n_elements))
+    assert dfs.find_containing_element(606200, 6905480) == 317
+    assert dfs.find_containing_element(0.0, 0.0) == -1
+
+
+def test_interp_weights_mixed_mesh():
+    geom = _UnstructuredGeometry()
+    nc = np.array([[0, 0, 0], [2, 0, 1], [2, 1, 2], [0, 1, 3], [3, 0, 4]])
+    geom._set_nodes(nc, projection_string="UTM-32")
+    geom._set_elements([[0, 1, 2, 3], [1, 4, 2]])
+
+    elem_ids, weights = geom.interp_weights([0.5, 2.2, 5.0], [0.5, 0.3, 0.0])
+
+    np.testing.assert_array_equal(elem_ids, [0, 1, -1])
+    assert weights.shape == (3, 5)
+    np.testing.assert_allclose(weights @ nc[:, 2], [1.25, 1.9, 0.0])
+
+
+def test_get_interpolant_mixed_mesh():
+    geom = _UnstructuredGeometry()
+    nc = np.array([[0, 0, 0], [2, 0, 1], [2, 1, 2], [0, 1, 3], [3, 0, 4]])
+    geom._set_nodes(nc, projection_string="UTM-32")
+    geom._set_elements([[0, 1, 2, 3], [1, 4, 2]])
+    x = np.array([0.5, 2.2, 5.0])
+    y = np.array([0.5, 0.3, 0.0])
+    values = np.array([10.0, 20.0])
+
+    nearest = geom._get_interpolant(x, y, method="nearest")
+    np.testing.assert_array_equal(nearest(values), [10.0, 20.0, np.nan])
+
+    linear = geom._get_interpolant(x, y, method="linear")
+    d = linear(values)
+    assert np.isnan(d[2])
+    assert 10.0 <= d[0] <= 20.0
+
+    with pytest.raises(ValueError):
+        geom._get_interpolant(x, y, method="cubic")
+
+
+def test_topology_mixed_mesh():
+    geom = _UnstructuredGeometry()
+    nc = np.array([[0, 0, 0], [2, 0, 1], [2, 1, 2], [0, 1, 3], [3, 0, 4]])
+    geom._set_nodes(nc, codes=[1, 0, 0, 1, 2], projection_string="UTM-32")
+    geom._set_elements([[0, 1, 2, 3], [1, 4, 2]])
+
+    elements, offsets = geom.get_node_elements()
+    np.testing.assert_array_equal(offsets, [0, 1, 3, 5, 6, 7])
+    np.testing.assert_array_equal(elements, [0, 0, 1, 0, 1, 0, 1])
+
+    nb = geom.get_element_neighbours()
+    np.testing.assert_array_equal(nb, [[-1, 1, -1, -1], [-1, -1, 0, -1]])
+
+    edges, codes = geom.get_boundary_edges()
+    assert len(edges) == 5
+    code = {tuple(sorted(e)): c for e, c in zip(edges, codes)}
+    assert code[(0, 1)] == 1
+    assert code[(1, 4)] == 2
+    assert code[(2, 3)] == 1
+
+
+def test_get_element_neighbours_3d_fails():
+    filename = os.path.join("tests", "testdata", "basin_3d.dfsu")
+    dfs = Dfsu(filename)
+
+    with pytest.raises(Exception):
+        dfs.get_element_neighbours()
+
+    nb = dfs.geometry2d.get_element_neighbours()
+    assert nb.shape[0] == dfs.geometry2d.n_elements
+
+
+def test_create_tri_only_element_table():
+    geom = _UnstructuredGeometry()
+    nc = np.array([[0, 0, 0], [2, 0, 1], [2, 1, 2], [0, 1, 3], [3, 0, 4]])
+    geom._set_nodes(nc, projection_string="UTM-32")
+    geom._set_elements([[0, 1, 2, 3], [1, 4, 2]])
+
+    elem_table, ec = geom._create_tri_only_element_table()
+
+    np.testing.assert_array_equal(elem_table, [[0, 1, 2], [1, 4, 2], [2, 3, 0]])
+    np.testing.assert_array_equal(ec[2], geom.element_coordinates[0])
+    assert geom._create_tri_only_element_table()[0] is elem_table
+
+
 def test_find_nearest_element_3d():
     filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
     dfs = Dfsu(filename)
@@ -520,6 +831,17 @@ def test_get_element_area_3D():
     assert areas[0] == 350186.43530453625
 
 
+def test_get_element_area_3D_is_column_area():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    areas = dfs.get_element_area()
+
+    areas2d = dfs.geometry2d.get_element_area()
+    np.testing.assert_allclose(areas[dfs.top_elements], areas2d)
+    np.testing.assert_allclose(areas[dfs.bottom_elements], areas2d)
+    assert dfs.get_element_area() is areas
+
+
 def test_get_element_area_LONGLAT():
     filename = os.path.join("tests", "testdata", "wind_north_sea.dfsu")
     dfs = Dfsu(filename)
@@ -758,6 +1080,46 @@ def test_to_mesh_2d(tmpdir):
     assert True
 
 
+def test_to_dfs2(tmpdir):
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+
+    outfilename = os.path.join(tmpdir, "hd2d.dfs2")
+
+    dfs.to_dfs2(outfilename, dx=100, items=[0], time_steps=[0, 2, 4])
+
+    dfs2 = Dfs2(outfilename)
+    ds = dfs2.read()
+    assert dfs2.dx == 100
+    assert ds.data[0].shape == (3, 47, 17)
+    assert ds.items[0].name == "Surface elevation"
+    assert ds.time[1] - ds.time[0] == 2 * timedelta(seconds=dfs.timestep)
+
+    # grid cell closest to the center of element 100, row 0 is the top
+    x0, y0 = dfs.node_coordinates[:, :2].min(axis=0) + 50
+    xe, ye = dfs.element_coordinates[100, :2]
+    j = int(round((xe - x0) / 100))
+    i = int(round((ye - y0) / 100))
+    elem = dfs.find_containing_element(x0 + 100 * j, y0 + 100 * i)
+    expected = dfs.read(items=[0], time_steps=[4]).data[0][0, elem]
+    assert ds.data[0][2, 46 - i, j] == pytest.approx(expected)
+
+
+def test_to_mesh_single_element(tmpdir):
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    geometry = dfs.elements_to_geometry([0])
+
+    elem_table = geometry._element_table_to_dotnet()
+    assert elem_table.Length == 1
+
+    msh = Mesh(os.path.join("tests", "testdata", "odense_rough.mesh"))
+    outfilename = os.path.join(tmpdir, "single.mesh")
+    msh.write(outfilename, elements=[0])
+
+    assert Mesh(outfilename).n_elements == 1
+
+
 def test_plot_2d():
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
     dfs = Dfsu(filename)
@@ -785,6 +1147,25 @@ def test_elements_to_geometry():
     assert "nodes" in text
 
 
+def test_elements_to_geometry_node_layers():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    top_ids = dfs.top_elements[:50]
+
+    geom_top = dfs.elements_to_geometry(top_ids, node_layers="top")
+    geom_bot = dfs.elements_to_geometry(top_ids, node_layers="bottom")
+
+    assert geom_top.is_2d
+    assert geom_top.n_elements == 50
+    assert geom_top.max_nodes_per_element == 3
+    assert geom_top.n_nodes == geom_bot.n_nodes
+    np.testing.assert_array_equal(geom_top.node_ids, np.arange(geom_top.n_nodes))
+    np.testing.assert_allclose(
+        geom_top.element_coordinates[:, :2], dfs.element_coordinates[top_ids, :2]
+    )
+    assert geom_top.node_coordinates[:, 2].mean() > geom_bot.node_coordinates[:, 2].mean()
+
+
 def test_to_shapely():
     filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
     dfs = Dfsu(filename)
@@ -792,6 +1173,35 @@ def test_to_shapely():
     assert True
 
 
+def test_to_shapely_dissolve():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    mp = dfs.to_shapely()
+    outline = dfs.to_shapely(dissolve=True)
+
+    assert len(mp.geoms) == dfs.n_elements
+    assert outline.area == pytest.approx(dfs.get_element_area().sum())
+
+
+def test_to_geojson(tmpdir):
+    import json
+
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    outfilename = os.path.join(tmpdir, "mesh.geojson")
+    depth = dfs.element_coordinates[:, 2]
+
+    dfs.to_geojson(outfilename, {"depth": depth}, chunk_size=100)
+
+    with open(outfilename) as f:
+        features = json.load(f)["features"]
+    assert len(features) == dfs.n_elements
+    assert features[31]["properties"]["depth"] == depth[31]
+    ring = features[31]["geometry"]["coordinates"][0]
+    assert len(ring) == 4
+    assert ring[0] == ring[-1]
+
+
 def test_element_table():
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
     dfs = Dfsu(filename)
@@ -800,6 +1210,31 @@ def test_element_table():
     assert nid == [32, 28, 23]   
 
 
+def test_element_coordinates_of_subset():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    elements = [3, 31, 100, 500]
+    geom = dfs.elements_to_geometry(elements)
+
+    np.testing.assert_allclose(
+        geom.element_coordinates, dfs.element_coordinates[elements]
+    )
+
+
+def test_element_table_connectivity():
+    filename = os.path.join("tests", "testdata", "oresund_sigma_z.dfsu")
+    dfs = Dfsu(filename)
+    connectivity, offsets = dfs._get_connectivity()
+
+    assert connectivity.dtype == np.int32
+    assert offsets.dtype == np.int64
+    assert len(offsets) == dfs.n_elements + 1
+    assert dfs.max_nodes_per_element == 6
+    eid = 31
+    nid = connectivity[offsets[eid] : offsets[eid + 1]]
+    assert list(nid) == dfs.element_table[eid]
+
+
 def test_get_node_centered_data():
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
     dfs = Dfsu(filename)
@@ -814,6 +1249,38 @@ def test_get_node_centered_data():
     assert wl_nodes[nid].mean() == 0.45935017355903907
     
 
+def test_get_node_centered_data_all_timesteps():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    ds = dfs.read(items="Surface elevation")
+    wl_cc = ds.data[0]
+
+    wl_nodes = dfs.get_node_centered_data(wl_cc)
+
+    assert wl_nodes.shape == (dfs.n_timesteps, dfs.n_nodes)
+    np.testing.assert_allclose(wl_nodes[2], dfs.get_node_centered_data(wl_cc[2]))
+    op1 = dfs._get_cell_to_node_operator()
+    op2 = dfs._get_cell_to_node_operator()
+    assert op1 is op2
+
+
+def test_get_node_centered_data_boundary_nodes():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    ds = dfs.read(items="Surface elevation", time_steps=[0])
+    wl_cc = ds.data[0][0]
+
+    wl_nodes = dfs.get_node_centered_data(wl_cc)
+
+    # a node with two elements has no pseudo-laplacian solution
+    elements, offsets = dfs.get_node_elements()
+    nodes = np.flatnonzero(np.diff(offsets) <= 2)
+    assert len(nodes) > 0
+    for n in nodes:
+        values = wl_cc[elements[offsets[n] : offsets[n + 1]]]
+        assert values.min() - 1e-9 <= wl_nodes[n] <= values.max() + 1e-9
+
+
 def test_plot_dfsu_contour():
     filename = os.path.join("tests", "testdata", "HD2D.dfsu")
     dfs = Dfsu(filename)
@@ -834,4 +1301,38 @@ def test_plot_dfsu():
     dfs = Dfsu(filename)
     data = dfs.read()
     dfs.plot(z=data[1][0,:])
-    assert True
\ No newline at end of file
+    assert True
+
+def test_plot_dfsu_update_values():
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    data = dfs.read()
+    ax = dfs.plot(z=data[1][0, :])
+    ax = dfs.plot(z=data[1][1, :], ax=ax)
+
+    assert len(ax.collections) == 1
+    np.testing.assert_array_equal(ax.collections[0].get_array(), data[1][1, :])
+
+
+def test_plot_dfsu_update_values_new_cmap():
+    import matplotlib.cm as cm
+
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    data = dfs.read()
+    ax = dfs.plot(z=data[1][0, :])
+    ax = dfs.plot(z=data[1][1, :], ax=ax, cmap=cm.jet)
+
+    assert len(ax.collections) == 2
+    assert ax.collections[-1].cmap is cm.jet
+
+
+def test_plot_dfsu_decimate():
+    import matplotlib.pyplot as plt
+
+    filename = os.path.join("tests", "testdata", "HD2D.dfsu")
+    dfs = Dfsu(filename)
+    _, ax = plt.subplots(figsize=(1, 1), dpi=20)
+    dfs.plot(ax=ax, decimate=True)
+
+    assert len(ax.collections[0].get_array()) < dfs.n_elements
@@ -1,6 +1,17 @@
 import numpy as np
+import pytest
+
+from mikeio.dotnet import (
+    to_dotnet_array,
+    to_numpy,
+    to_numpy_subset,
+    to_numpy_jagged,
+    to_dotnet_jagged,
+    asnetarray_v2,
+    BufferPool,
+)
+from mikeio.dutil import SubsetPlan
 
-from mikeio.dotnet import to_dotnet_array
 
 def test_float_array_np_dotnet():
 
@@ -8,4 +19,90 @@ def test_float_array_np_dotnet():
 
     netx = to_dotnet_array(x)
 
-    assert netx.Length == 10
\ No newline at end of file
+    assert netx.Length == 10
+
+
+def test_to_numpy_copies_into_buffer():
+
+    x = np.random.random(10).astype(np.float32)
+    netx = to_dotnet_array(x)
+
+    buffer = np.zeros(10, dtype=np.float32)
+    y = to_numpy(netx, out=buffer)
+
+    assert y is buffer
+    np.testing.assert_array_equal(y, x)
+
+
+def test_to_numpy_does_not_share_memory_with_dotnet():
+
+    x = np.ones(5, dtype=np.float32)
+    netx = to_dotnet_array(x)
+
+    y = to_numpy(netx)
+    y[0] = 2.0
+
+    assert netx[0] == 1.0
+
+
+def test_to_numpy_wrong_buffer_fails():
+
+    netx = to_dotnet_array(np.ones(5, dtype=np.float32))
+
+    with pytest.raises(ValueError):
+        to_numpy(netx, out=np.zeros(5))  # float64
+
+
+def test_buffer_pool_reuses_buffer():
+
+    pool = BufferPool()
+
+    y1 = pool.to_numpy(to_dotnet_array(np.ones(5, dtype=np.float32)), key=0)
+    y2 = pool.to_numpy(to_dotnet_array(np.zeros(5, dtype=np.float32)), key=0)
+
+    assert y1 is y2
+    assert y2.sum() == 0.0
+
+
+def test_to_numpy_subset():
+
+    x = np.arange(100, dtype=np.float32)
+    netx = to_dotnet_array(x)
+
+    y = to_numpy_subset(netx, SubsetPlan([99, 5, 6, 7, 50]))
+
+    np.testing.assert_array_equal(y, [99, 5, 6, 7, 50])
+
+
+def test_to_numpy_jagged():
+
+    rows = [[1, 2, 3], [4, 5, 6, 7], [8, 9, 10]]
+    table = asnetarray_v2([to_dotnet_array(np.array(r, dtype=np.int32)) for r in rows])
+
+    values, offsets = to_numpy_jagged(table)
+
+    assert values.dtype == np.int32
+    np.testing.assert_array_equal(values, np.arange(1, 11))
+    np.testing.assert_array_equal(offsets, [0, 3, 7, 10])
+
+
+def test_to_dotnet_jagged_round_trip():
+
+    values = np.arange(1, 11, dtype=np.int32)
+    offsets = np.array([0, 3, 7, 10])
+
+    table = to_dotnet_jagged(values, offsets)
+
+    assert table.Length == 3
+    assert table[1].Length == 4
+    v, o = to_numpy_jagged(table)
+    np.testing.assert_array_equal(v, values)
+    np.testing.assert_array_equal(o, offsets)
+
+
+def test_to_dotnet_jagged_single_row():
+
+    table = to_dotnet_jagged(np.array([1, 2, 3], dtype=np.int32), np.array([0, 3]))
+
+    assert table.Length == 1
+    assert table[0][2] == 3
@@ -1,5 +1,9 @@
+import sys
+import subprocess
+import numpy as np
 import pytest
 import mikeio
+from mikeio.dutil import Dataset
 
 
 def test_read_dfs0_generic_read():
@@ -40,6 +44,15 @@ def test_read_dfsu_generic_read():
     assert len(ds) == 4
 
 
+def test_read_dfsu_generic_read_float32():
+
+    filename = "tests/testdata/HD2D.dfsu"
+
+    ds = mikeio.read(filename, dtype=np.float32)
+
+    assert ds.data[0].dtype == np.float32
+
+
 #def test_read_dfsu_generic_read_single_item_number():
 
 #   filename = "tests/testdata/HD2D.dfsu"
@@ -57,3 +70,60 @@ def test_read_generic_read_unsupported_format():
     with pytest.raises(Exception):
         res = mikeio.read(filename)
 
+
+def test_read_many_in_order():
+
+    filenames = ["tests/testdata/random.dfs0", "tests/testdata/HD2D.dfsu"]
+
+    res = mikeio.read_many(filenames, workers=2, executor="thread")
+
+    assert len(res) == 2
+    assert res[0].data[0].shape == (1000,)
+    assert res[1].data[0].shape == (9, 884)
+
+
+def test_read_many_capture_errors():
+
+    filenames = ["tests/testdata/random.dfs0", "tests/testdata/not_a_file.dfs0"]
+
+    res = mikeio.read_many(filenames, workers=2, errors="capture")
+
+    assert isinstance(res[0], Dataset)
+    assert isinstance(res[1], FileNotFoundError)
+
+    with pytest.raises(FileNotFoundError):
+        mikeio.read_many(filenames, workers=2)
+
+
+def test_read_many_concatenate():
+
+    filenames = ["tests/testdata/HD2D.dfsu"] * 2
+
+    ds = mikeio.read_many(filenames, items=[0], workers=1, concatenate=True)
+
+    assert ds.data[0].shape == (18, 884)
+
+
+def test_read_many_concatenate_all_files_failed():
+
+    filenames = ["tests/testdata/not_a_file.dfs0", "tests/testdata/not_a_file.dfsu"]
+
+    with pytest.raises(ValueError):
+        mikeio.read_many(filenames, workers=1, errors="capture", concatenate=True)
+
+    with pytest.raises(ValueError):
+        mikeio.read_many([], workers=1, concatenate=True)
+
+
+def test_import_does_not_load_dotnet_or_matplotlib():
+
+    code = (
+        "import sys, mikeio;"
+        "print(sorted({'clr', 'DHI', 'matplotlib'} & set(sys.modules)))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True
+    )
+
+    assert res.stdout.decode().strip() == "[]"
+
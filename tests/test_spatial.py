@@ -1,4 +1,4 @@
-from mikeio.spatial import dist_in_meters
+from mikeio.spatial import dist_in_meters, BoxBuckets, points_in_polygon
 import numpy as np
 
 
@@ -15,3 +15,29 @@ def test_dist_in_meters():
     assert dist.shape == (n,)
     assert dist.max() < 20040000
 
+
+
+def test_box_buckets_candidates():
+
+    # 10 x 10 unit boxes
+    xmin, ymin = np.meshgrid(np.arange(10.0), np.arange(10.0))
+    xmin = xmin.ravel()
+    ymin = ymin.ravel()
+    buckets = BoxBuckets(xmin, ymin, xmin + 1, ymin + 1)
+
+    points, boxes = buckets.candidates([2.5, 9.5, 20.0], [3.5, 0.5, 1.0])
+
+    np.testing.assert_array_equal(points, [0, 1])
+    np.testing.assert_array_equal(boxes, [32, 9])
+
+
+def test_points_in_polygon():
+
+    # L-shaped polygon
+    polygon = [[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2]]
+
+    x = [0.5, 1.5, 1.5, 0.5, 3.0]
+    y = [0.5, 0.5, 1.5, 1.5, 0.5]
+    inside = points_in_polygon(x, y, polygon)
+
+    np.testing.assert_array_equal(inside, [True, True, False, True, False])